@@ -12,8 +12,11 @@ from src.subnet.validator.challenges.generator_thread import ChallengeGeneratorT
 from src.subnet.validator.database.models.challenge_balance_tracking import ChallengeBalanceTrackingManager
 from src.subnet.validator.database.models.challenge_funds_flow import ChallengeFundsFlowManager
 from src.subnet.validator.database.models.miner_discovery import MinerDiscoveryManager
+from src.subnet.validator.database.models.miner_latency import MinerLatencyManager
 from src.subnet.validator.database.models.miner_receipt import MinerReceiptManager
 from src.subnet.validator.database.session_manager import DatabaseSessionManager, run_migrations
+from src.subnet.validator.miner_selection import get_selection_policy
+from src.subnet.validator.score_board import ScoreBoard
 from src.subnet.validator.weights_storage import WeightsStorage
 from src.subnet.validator._config import load_environment, SettingsManager
 from src.subnet.validator.validator import Validator
@@ -87,7 +90,14 @@ if __name__ == "__main__":
         challenge_balance_tracking_manager,
         miner_receipt_manager,
         query_timeout=settings.QUERY_TIMEOUT,
-        challenge_timeout=settings.CHALLENGE_TIMEOUT
+        challenge_timeout=settings.CHALLENGE_TIMEOUT,
+        client_idle_timeout=settings.MINER_CLIENT_IDLE_TIMEOUT,
+        metagraph_refresh_interval=settings.METAGRAPH_REFRESH_INTERVAL,
+        miner_latency_manager=MinerLatencyManager(session_manager),
+        latency_rollup_interval=settings.LATENCY_ROLLUP_INTERVAL,
+        query_hedging=settings.QUERY_HEDGING,
+        selection_policy=get_selection_policy(settings.QUERY_SELECTION_POLICY, settings.QUERY_EXPLORATION_RATE),
+        score_board=ScoreBoard(settings.SCORE_BOARD_FILE_NAME),
     )
 
 
@@ -108,6 +118,7 @@ if __name__ == "__main__":
         threshold=settings.CHALLENGE_THRESHOLD,
         terminate_event=validator.terminate_event)
     challenge_generator_thread.start()
+    validator.metagraph.start()
 
     try:
         asyncio.run(validator.validation_loop(settings))
@@ -115,5 +126,6 @@ if __name__ == "__main__":
         logger.info("Validator loop interrupted")
 
     challenge_generator_thread.join()
+    validator.metagraph.join()
     logger.info(f"Challenge generator stopped successfully.")
 
@@ -4,18 +4,26 @@ from communex.client import CommuneClient
 from communex.compat.key import classic_load_key
 import sys
 
+import aioredis
+from bitcoinrpc.authproxy import AuthServiceProxy
+
 from fastapi import Security, HTTPException
 from fastapi.security import APIKeyHeader
 from loguru import logger
-from substrateinterface import Keypair
+from substrateinterface import Keypair, SubstrateInterface
 
+from src.subnet.protocol import NETWORK_BITCOIN, NETWORK_COMMUNE
+from src.subnet.validator.chain_tip import ChainTipCache
 from src.subnet.validator.database.models.api_key import ApiKeyManager
 from src.subnet.validator.database.models.challenge_balance_tracking import ChallengeBalanceTrackingManager
 from src.subnet.validator.database.models.challenge_funds_flow import ChallengeFundsFlowManager
 from src.subnet.validator.database.models.miner_discovery import MinerDiscoveryManager
+from src.subnet.validator.database.models.miner_latency import MinerLatencyManager
 from src.subnet.validator.database.models.miner_receipt import MinerReceiptManager
 from src.subnet.validator._config import load_environment, SettingsManager
 from src.subnet.validator.database.session_manager import DatabaseSessionManager
+from src.subnet.validator.miner_selection import get_selection_policy
+from src.subnet.validator.query_cache import QueryResultCache
 from src.subnet.gateway.rate_limiter import RateLimiterMiddleware
 from src.subnet.validator.validator import Validator
 from src.subnet.validator.weights_storage import WeightsStorage
@@ -72,12 +80,52 @@ validator = Validator(
     miner_receipt_manager,
     query_timeout=settings.QUERY_TIMEOUT,
     challenge_timeout=settings.CHALLENGE_TIMEOUT,
+    client_idle_timeout=settings.MINER_CLIENT_IDLE_TIMEOUT,
+    metagraph_refresh_interval=settings.METAGRAPH_REFRESH_INTERVAL,
+    miner_latency_manager=MinerLatencyManager(session_manager),
+    latency_rollup_interval=settings.LATENCY_ROLLUP_INTERVAL,
+    query_hedging=settings.QUERY_HEDGING,
+    selection_policy=get_selection_policy(settings.QUERY_SELECTION_POLICY, settings.QUERY_EXPLORATION_RATE),
+)
+
+
+def bitcoin_block_height() -> int:
+    rpc_connection = AuthServiceProxy(settings.BITCOIN_NODE_RPC_URL)
+    try:
+        return rpc_connection.getblockcount()
+    finally:
+        rpc_connection._AuthServiceProxy__conn.close()
+
+
+def commune_block_height() -> int:
+    substrate = SubstrateInterface(url=settings.COMMUNE_NODE_RPC)
+    try:
+        return substrate.get_block_header()['header']['number']
+    finally:
+        substrate.close()
+
+
+chain_tip = ChainTipCache({
+    NETWORK_BITCOIN: bitcoin_block_height,
+    NETWORK_COMMUNE: commune_block_height,
+}, ttl=settings.QUERY_CACHE_TTL)
+
+query_cache = QueryResultCache(
+    aioredis.from_url(settings.REDIS_URL),
+    max_entries=settings.QUERY_CACHE_MAX_ENTRIES,
+    ttl=settings.QUERY_CACHE_TTL,
+    finalized_ttl=settings.QUERY_CACHE_FINALIZED_TTL,
+    chain_tip=chain_tip,
 )
 
 
 def get_validator():
     return validator
 
+
+def get_query_cache():
+    return query_cache
+
 api_key_header = APIKeyHeader(name='x-api-key', auto_error = False)
 
 
@@ -3,6 +3,8 @@ from enum import Enum
 from fastapi.responses import JSONResponse, PlainTextResponse
 from datetime import datetime
 
+from src.subnet.validator.query_cache import cache_headers
+
 # ResponseType Enum
 class ResponseType(str, Enum):
     json = "json"
@@ -26,11 +28,12 @@ def format_response(data: dict, response_type: ResponseType):
         else:
             return serialize_datetime(data)
 
+    headers = cache_headers(data)
     processed_data = process_data(data)  # Ensure that datetime objects are handled for JSON or graph response
 
     if response_type == ResponseType.graph:
         # For graph format, use the processed data and a custom media type
-        return JSONResponse(content=processed_data, media_type="application/vnd.graph+json")
+        return JSONResponse(content=processed_data, media_type="application/vnd.graph+json", headers=headers)
 
     # Default to JSON response
-    return JSONResponse(content=processed_data)
+    return JSONResponse(content=processed_data, headers=headers)
@@ -1,9 +1,11 @@
+import asyncio
+
 import uvicorn
 from fastapi import FastAPI
 from loguru import logger
 from starlette.middleware.cors import CORSMiddleware
 import sys
-from src.subnet.gateway import patch_record, settings
+from src.subnet.gateway import patch_record, settings, validator
 from src.subnet.gateway.rate_limiter import RateLimiterMiddleware
 from src.subnet.gateway.routes.v1.balance_tracking import balance_tracking_router
 from src.subnet.gateway.routes.v1.funds_flow import funds_flow_router
@@ -30,6 +32,18 @@ app = FastAPI(
     version="0.1.0"
 )
 
+
+@app.on_event("startup")
+async def start_latency_rollup():
+    app.state.latency_rollup = asyncio.create_task(validator.latency_rollup_loop())
+
+
+@app.on_event("shutdown")
+async def stop_latency_rollup():
+    app.state.latency_rollup.cancel()
+    await asyncio.gather(app.state.latency_rollup, return_exceptions=True)
+
+
 app.include_router(funds_flow_router)
 app.include_router(balance_tracking_router)
 app.include_router(miner_router)
@@ -1,10 +1,11 @@
 import re
 from datetime import datetime, timezone
 from typing import Optional, List
-from fastapi import Depends, APIRouter, Query, HTTPException
+from fastapi import Depends, APIRouter, Query, HTTPException, Response
 from pydantic import BaseModel
 from src.subnet.validator.validator import Validator
-from src.subnet.gateway import get_validator, api_key_auth
+from src.subnet.gateway import get_validator, get_query_cache, api_key_auth
+from src.subnet.validator.query_cache import QueryResultCache, cache_headers
 from src.subnet.gateway.services.balance_tracking_query_api import BalanceTrackingQueryAPI
 
 
@@ -36,8 +37,10 @@ def validate_date_format(date_str: str) -> datetime:
 @balance_tracking_router.get("/{network}/deltas")
 async def get_balance_deltas(
         network: str,
+        response: Response,
         addresses: List[str] = Query(None, description="List of addresses to track"),
         validator: Validator = Depends(get_validator),
+        query_cache: QueryResultCache = Depends(get_query_cache),
         page: int = Query(1, ge=1, description="Page number"),
         page_size: int = Query(100, ge=1, le=1000, description="Items per page"),
         api_key: str = Depends(api_key_auth),
@@ -55,7 +58,7 @@ async def get_balance_deltas(
             detail="Maximum 1000 addresses can be provided"
         )
 
-    query_api = BalanceTrackingQueryAPI(validator)
+    query_api = BalanceTrackingQueryAPI(validator, query_cache)
     data = await query_api.get_balance_deltas(
         network=network,
         addresses=addresses,
@@ -63,12 +66,14 @@ async def get_balance_deltas(
         page_size=page_size,
     )
 
+    response.headers.update(cache_headers(data))
     return data
 
 
 @balance_tracking_router.get("/{network}/timestamps")
 async def get_timestamps(
         network: str,
+        response: Response,
         start_date: Optional[str] = Query(
             None,
             description="Start date in YYYY-MM-DD format (UTC)",
@@ -78,6 +83,7 @@ async def get_timestamps(
             description="End date in YYYY-MM-DD format (UTC)",
         ),
         validator: Validator = Depends(get_validator),
+        query_cache: QueryResultCache = Depends(get_query_cache),
         page: int = Query(1, ge=1, description="Page number"),
         page_size: int = Query(100, ge=1, le=1000, description="Items per page"),
         api_key: str = Depends(api_key_auth),
@@ -105,7 +111,7 @@ async def get_timestamps(
                 detail="start_date cannot be later than end_date"
             )
 
-    query_api = BalanceTrackingQueryAPI(validator)
+    query_api = BalanceTrackingQueryAPI(validator, query_cache)
     data = await query_api.get_balance_tracking_timestamp(
         network=network,
         start_date=start_date,
@@ -114,4 +120,5 @@ async def get_timestamps(
         page_size=page_size,
     )
 
+    response.headers.update(cache_headers(data))
     return data
\ No newline at end of file
@@ -3,11 +3,12 @@ from fastapi import Depends, APIRouter, Query, HTTPException
 from pydantic import BaseModel
 from src.subnet.protocol import NETWORK_BITCOIN, NETWORK_COMMUNE
 from src.subnet.validator.validator import Validator
-from src.subnet.gateway import get_validator, api_key_auth
+from src.subnet.gateway import get_validator, get_query_cache, api_key_auth
 from src.subnet.gateway.models.factories import get_graph_transformer
 from src.subnet.gateway.services.bitcoin_funds_flow_query_api import BitcoinFundsFlowQueryApi
 from src.subnet.gateway.services.commune_funds_flow_query_api import CommuneFundsFlowQueryApi
 from src.subnet.gateway.helpers.reponse_formatter import format_response, ResponseType
+from src.subnet.validator.query_cache import QueryResultCache
 
 funds_flow_router = APIRouter(prefix="/v1/funds-flow", tags=["funds-flow"])
 
@@ -16,12 +17,12 @@ class MinerMetadataRequest(BaseModel):
     network: Optional[str] = None
 
 
-def select_query_api(network: str, validator: Validator):
+def select_query_api(network: str, validator: Validator, query_cache: QueryResultCache):
     """Helper function to select the appropriate query API."""
     if network == NETWORK_BITCOIN:
-        return BitcoinFundsFlowQueryApi(validator)
+        return BitcoinFundsFlowQueryApi(validator, query_cache)
     elif network == NETWORK_COMMUNE:
-        return CommuneFundsFlowQueryApi(validator)
+        return CommuneFundsFlowQueryApi(validator, query_cache)
     raise HTTPException(status_code=400, detail="Invalid network.")
 
 
@@ -31,9 +32,10 @@ async def get_blocks(
     block_heights: List[int] = Query(..., description="List of block heights (maximum 10)", min_length=1, max_length=10),
     response_type: ResponseType = Query(ResponseType.json),
     validator: Validator = Depends(get_validator),
+    query_cache: QueryResultCache = Depends(get_query_cache),
     api_key: str = Depends(api_key_auth),
 ):
-    query_api = select_query_api(network, validator)
+    query_api = select_query_api(network, validator, query_cache)
     data = await query_api.get_blocks(block_heights)
 
     if not data.get("response"):
@@ -54,9 +56,10 @@ async def get_transaction_by_tx_id(
     right_hops: int = Query(2, description="Number of hops to the right", ge=0, le=4),
     response_type: ResponseType = Query(ResponseType.json),
     validator: Validator = Depends(get_validator),
+    query_cache: QueryResultCache = Depends(get_query_cache),
     api_key: str = Depends(api_key_auth),
 ):
-    query_api = select_query_api(network, validator)
+    query_api = select_query_api(network, validator, query_cache)
     data = await query_api.get_blocks_around_transaction(tx_id, left_hops, right_hops)
 
     if not data.get("response"):
@@ -78,9 +81,10 @@ async def get_address_transactions(
     limit: Optional[int] = Query(100),
     response_type: ResponseType = Query(ResponseType.json),
     validator: Validator = Depends(get_validator),
+    query_cache: QueryResultCache = Depends(get_query_cache),
     api_key: str = Depends(api_key_auth),
 ):
-    query_api = select_query_api(network, validator)
+    query_api = select_query_api(network, validator, query_cache)
     data = await query_api.get_address_transactions(
         address=address,
         left_hops=left_hops,
@@ -109,9 +113,10 @@ async def get_funds_flow(
     end_block_height: Optional[int] = Query(None),
     response_type: ResponseType = Query(ResponseType.json),
     validator: Validator = Depends(get_validator),
+    query_cache: QueryResultCache = Depends(get_query_cache),
     api_key: str = Depends(api_key_auth),
 ):
-    query_api = select_query_api(network, validator)
+    query_api = select_query_api(network, validator, query_cache)
     data = await query_api.get_funds_flow(
         address=address,
         direction=direction,
@@ -49,3 +49,16 @@ async def get_miners_per_network(
                           api_key: str = Depends(api_key_auth)):
     results = await validator.miner_discovery_manager.get_miners_per_network()
     return results
+
+
+@miner_router.get("/miner/latency")
+async def get_latency(miner_key: Optional[str] = None, endpoint: Optional[str] = None, limit: int = 100,
+                      validator: Validator = Depends(get_validator),
+                      api_key: str = Depends(api_key_auth)):
+    rollups = []
+    if validator.miner_latency_manager is not None:
+        rollups = await validator.miner_latency_manager.get_latency_rollups(miner_key, endpoint, limit=limit)
+    return {
+        "live": validator.latency.summary(miner_key, endpoint),
+        "rollups": rollups
+    }
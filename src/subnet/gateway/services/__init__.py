@@ -3,6 +3,13 @@ from typing import Optional, List
 
 class FundsFlowQueryApi:
 
+    @staticmethod
+    def pinned_block_heights(start_block_height: Optional[int], end_block_height: Optional[int]) -> Optional[List[int]]:
+        # only a closed block range pins a query, its result is final once both ends are confirmed
+        if start_block_height is None or end_block_height is None:
+            return None
+        return [start_block_height, end_block_height]
+
     async def get_block(self, block_height: int) -> dict:
 
 
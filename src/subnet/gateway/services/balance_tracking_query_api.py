@@ -2,16 +2,21 @@ from datetime import datetime
 from typing import Optional
 from src.subnet.protocol import MODEL_KIND_BALANCE_TRACKING
 from src.subnet.validator.validator import Validator
+from src.subnet.validator.query_cache import QueryResultCache
 
 
 class BalanceTrackingQueryAPI:
-    def __init__(self, validator: Validator):
+    def __init__(self, validator: Validator, query_cache: Optional[QueryResultCache] = None):
         super().__init__()
         self.validator = validator
+        self.query_cache = query_cache
 
-    async def _execute_query(self, network: str, query: str, model_kind = MODEL_KIND_BALANCE_TRACKING) -> dict:
+    async def _execute_query(self, network: str, query: str, model_kind = MODEL_KIND_BALANCE_TRACKING, finalized: bool = False) -> dict:
         try:
-            data = await self.validator.query_miner(network, model_kind, query, miner_key=None)
+            fetch = lambda: self.validator.query_miner(network, model_kind, query, miner_key=None)
+            if self.query_cache is None:
+                return await fetch()
+            data = await self.query_cache.get_or_query(network, model_kind, query, fetch, finalized)
             return data
         except Exception as e:
             raise Exception(f"Error executing query: {str(e)}")
@@ -125,5 +130,7 @@ class BalanceTrackingQueryAPI:
                 ) as response_json;
         """
 
-        result = await self._execute_query(network, query)
+        # days before today are complete, a range ending earlier only covers finalized blocks
+        finalized = end_date is not None and end_datetime.date() < datetime.utcnow().date()
+        result = await self._execute_query(network, query, finalized=finalized)
         return result
\ No newline at end of file
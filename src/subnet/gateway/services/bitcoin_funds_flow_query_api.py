@@ -2,16 +2,21 @@ from typing import Optional, List
 from src.subnet.protocol import NETWORK_BITCOIN, MODEL_KIND_FUNDS_FLOW
 from src.subnet.validator.validator import Validator
 from src.subnet.gateway.services import FundsFlowQueryApi
+from src.subnet.validator.query_cache import QueryResultCache
 
 
 class BitcoinFundsFlowQueryApi(FundsFlowQueryApi):
-    def __init__(self, validator: Validator):
+    def __init__(self, validator: Validator, query_cache: Optional[QueryResultCache] = None):
         super().__init__()
         self.validator = validator
+        self.query_cache = query_cache
 
-    async def _execute_query(self, query: str, model_kind=MODEL_KIND_FUNDS_FLOW) -> dict:
+    async def _execute_query(self, query: str, model_kind=MODEL_KIND_FUNDS_FLOW, block_heights: Optional[List[int]] = None) -> dict:
         try:
-            data = await self.validator.query_miner(NETWORK_BITCOIN, model_kind, query, miner_key=None)
+            fetch = lambda: self.validator.query_miner(NETWORK_BITCOIN, model_kind, query, miner_key=None)
+            if self.query_cache is None:
+                return await fetch()
+            data = await self.query_cache.get_or_query(NETWORK_BITCOIN, model_kind, query, fetch, block_heights=block_heights)
             return data
         except Exception as e:
             raise Exception(f"Error executing query: {str(e)}")
@@ -27,7 +32,7 @@ class BitcoinFundsFlowQueryApi(FundsFlowQueryApi):
             RETURN path1, path2
         """
 
-        data = await self._execute_query(query)
+        data = await self._execute_query(query, block_heights=block_heights)
         return data
 
     async def get_blocks_around_transaction(self, tx_id: str, left_hops: int, right_hops: int) -> dict:
@@ -110,5 +115,5 @@ class BitcoinFundsFlowQueryApi(FundsFlowQueryApi):
         final_query = "\n".join(query_elements)
 
         # Execute the query and transform the results
-        data = await self._execute_query(final_query)
+        data = await self._execute_query(final_query, block_heights=self.pinned_block_heights(start_block_height, end_block_height))
         return data
@@ -0,0 +1,160 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import pytest
+from substrateinterface import Keypair
+
+from src.subnet.protocol import Discovery, MODEL_KIND_BALANCE_TRACKING, MODEL_KIND_FUNDS_FLOW, NETWORK_BITCOIN
+from src.subnet.validator._config import ValidatorSettings
+from src.subnet.validator.challenges.assignment_plan import ChallengeAssignmentPlan
+from src.subnet.validator.metagraph import MetagraphSnapshot
+from src.subnet.validator.score_board import ScoreBoard
+from src.subnet.validator.scoring_context import ScoringContext
+from src.subnet.validator.validator import PreparedRound, Validator
+from src.subnet.validator.weights_storage import WeightsStorage
+
+# (fn, miner_key, params, timeout) -> response, the miner side of FakeModuleClient
+MinerHandler = Callable[[str, str, Dict, float], Awaitable[Any]]
+
+FUNDS_FLOW_CHALLENGE = ('{"model_kind": "funds_flow", "in_total_amount": 1, "out_total_amount": 1, "tx_id_last_6_chars": "abcdef"}', 'tx-1')
+BALANCE_TRACKING_CHALLENGE = ('{"model_kind": "balance_tracking", "block_height": 1}', 42)
+
+
+class FakeMinerDiscoveryManager:
+    def __init__(self, miners: Optional[List[dict]] = None):
+        self.miners = miners or []
+        self.rows: Dict[str, dict] = {}
+        self.stored_metadata: List[List[dict]] = []
+        self.challenges: List[tuple] = []
+        self.ranks: Dict[str, float] = {}
+
+    async def get_miners_by_network(self, network):
+        return [miner for miner in self.miners if miner['network'] == network]
+
+    async def get_miner_by_key(self, miner_key, network):
+        return next((miner for miner in self.miners if miner['miner_key'] == miner_key), None)
+
+    async def store_miners_metadata(self, rows):
+        self.stored_metadata.append(list(rows))
+        self.rows.update({row['miner_key']: dict(row) for row in rows})
+
+    async def update_miners_challenges(self, rows):
+        self.challenges.extend(rows)
+        return {miner_key for miner_key, _, _ in rows if miner_key in self.rows}
+
+    async def update_miners_ranks(self, ranks):
+        self.ranks.update(ranks)
+
+
+class FakeMinerReceiptManager:
+    def __init__(self):
+        self.receipts: List[tuple] = []
+        self.accepted: List[tuple] = []
+
+    async def store_miner_receipt(self, request_id, miner_key, model_kind, network, query_hash, timestamp, response_hash):
+        self.receipts.append((request_id, miner_key, query_hash, response_hash))
+
+    async def accept_miner_receipt(self, request_id, miner_key):
+        self.accepted.append((request_id, miner_key))
+
+    async def get_receipts_count_by_networks(self):
+        return {}
+
+    async def get_receipt_miner_multiplier(self, *args, **kwargs):
+        return []
+
+
+class FakeChallengeManager:
+    def __init__(self, challenge: tuple):
+        self.challenge = challenge
+
+    async def get_challenges(self, network):
+        return [self.challenge]
+
+
+class FakeModuleClient:
+    def __init__(self, handler: MinerHandler):
+        self.handler = handler
+
+    async def call(self, fn, target_key, params={}, timeout=16, loads=json.loads):
+        # round trip through JSON like the wire, so the caller's decoder is exercised
+        return loads(json.dumps(await self.handler(fn, target_key, params, timeout)))
+
+
+class FakeModuleClients:
+    """Stands in for ModuleClientCache, routing every miner to one handler."""
+
+    def __init__(self, handler: MinerHandler):
+        self.handler = handler
+
+    async def get(self, ip, port, miner_key=None):
+        return FakeModuleClient(self.handler)
+
+    async def close(self):
+        pass
+
+
+class RecordingWeightSubmitter:
+    def __init__(self):
+        self.submissions: List[Dict[int, float]] = []
+
+    def submit(self, fn, settings, score_dict, *args, **kwargs):
+        self.submissions.append(dict(score_dict))
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(None)
+        return future
+
+    def shutdown(self, wait: bool = True):
+        pass
+
+
+def make_settings(**overrides) -> ValidatorSettings:
+    values = dict(NET_UID=1, MAX_ALLOWED_WEIGHTS=256, CHALLENGE_TIMEOUT=1, QUERY_TIMEOUT=1, ITERATION_INTERVAL=0)
+    values.update(overrides)
+    return ValidatorSettings.model_construct(**values)
+
+
+def make_miner(uid: int, network: str = NETWORK_BITCOIN) -> dict:
+    return {
+        'uid': uid, 'miner_key': f'miner-{uid}', 'miner_address': '127.0.0.1', 'miner_ip_port': str(9000 + uid),
+        'network': network, 'failed_challenges': 0, 'total_challenges': 0,
+    }
+
+
+def make_miner_info(uid: int):
+    return ('127.0.0.1', 9000 + uid), {'key': f'miner-{uid}', 'emission': uid}
+
+
+def make_prepared_round(uids: List[int]) -> PreparedRound:
+    miners = {uid: make_miner_info(uid) for uid in uids}
+    discovery = Discovery(network=NETWORK_BITCOIN, version=1.0, graph_db='neo4j')
+    plan = ChallengeAssignmentPlan({
+        uid: {MODEL_KIND_FUNDS_FLOW: FUNDS_FLOW_CHALLENGE, MODEL_KIND_BALANCE_TRACKING: BALANCE_TRACKING_CHALLENGE}
+        for uid in uids
+    })
+    return PreparedRound(miners, miners, set(), {uid: discovery for uid in uids}, plan, ScoringContext({NETWORK_BITCOIN: 1.0}, {}))
+
+
+def make_snapshot(validator: Validator, uids: List[int]) -> MetagraphSnapshot:
+    modules = {validator.key.ss58_address: {}, **{f'miner-{uid}': {} for uid in uids}}
+    return MetagraphSnapshot(modules, {uid: make_miner_info(uid) for uid in uids}, 0.0)
+
+
+@pytest.fixture
+def validator(tmp_path):
+    validator = Validator(
+        Keypair.create_from_uri('//Alice'),
+        1,
+        None,
+        WeightsStorage(str(tmp_path / 'weights.pkl')),
+        FakeMinerDiscoveryManager(),
+        FakeChallengeManager(FUNDS_FLOW_CHALLENGE),
+        FakeChallengeManager(BALANCE_TRACKING_CHALLENGE),
+        FakeMinerReceiptManager(),
+        query_timeout=1,
+        challenge_timeout=1,
+        score_board=ScoreBoard(str(tmp_path / 'score_board.pkl')),
+    )
+    validator.weight_submitter = RecordingWeightSubmitter()
+    return validator
@@ -0,0 +1,70 @@
+import pytest
+
+from src.subnet.protocol import NETWORK_BITCOIN, NETWORK_COMMUNE, MODEL_KIND_FUNDS_FLOW, MODEL_KIND_BALANCE_TRACKING
+from src.subnet.validator.challenges.assignment_plan import ChallengeAssignmentPlan
+from src.subnet.validator.challenges.challenge_pool import ChallengePool
+
+
+class FakeChallengeManager:
+    def __init__(self, challenges):
+        self.challenges = challenges
+        self.calls = 0
+
+    async def get_challenges(self, network):
+        self.calls += 1
+        return self.challenges.get(network, [])
+
+
+@pytest.fixture
+def managers():
+    funds_flow = FakeChallengeManager({NETWORK_BITCOIN: [(f"ff-{i}", f"tx-{i}") for i in range(10)]})
+    balance_tracking = FakeChallengeManager({NETWORK_BITCOIN: [("bt-0", "100")]})
+    return funds_flow, balance_tracking
+
+
+@pytest.mark.asyncio
+async def test_challenge_pool_samples_from_snapshot(managers):
+    pool = ChallengePool(*managers)
+    await pool.refresh()
+
+    [(challenge, tx_id)] = pool.draw(NETWORK_BITCOIN, MODEL_KIND_FUNDS_FLOW, 1)
+    assert challenge.startswith("ff-") and tx_id.startswith("tx-")
+    assert pool.draw(NETWORK_BITCOIN, MODEL_KIND_BALANCE_TRACKING, 3) == [("bt-0", "100")] * 3
+    assert pool.draw(NETWORK_COMMUNE, MODEL_KIND_FUNDS_FLOW, 1) == []
+
+
+@pytest.mark.asyncio
+async def test_challenge_pool_draw_without_replacement_uses_every_challenge(managers):
+    pool = ChallengePool(*managers)
+    await pool.refresh()
+
+    drawn = pool.draw(NETWORK_BITCOIN, MODEL_KIND_FUNDS_FLOW, 10, with_replacement=False)
+    assert len(set(drawn)) == 10
+
+    drawn = pool.draw(NETWORK_BITCOIN, MODEL_KIND_FUNDS_FLOW, 15, with_replacement=False)
+    assert len(drawn) == 15 and len(set(drawn)) == 10
+
+
+@pytest.mark.asyncio
+async def test_assignment_plan_skips_networks_without_challenges(managers):
+    pool = ChallengePool(*managers)
+    await pool.refresh()
+
+    plan = ChallengeAssignmentPlan.build(pool, {1: NETWORK_BITCOIN, 2: NETWORK_BITCOIN, 3: NETWORK_COMMUNE})
+    assert len(plan) == 2
+    assert set(plan.get(1).keys()) == {MODEL_KIND_FUNDS_FLOW, MODEL_KIND_BALANCE_TRACKING}
+    assert plan.get(3) is None
+
+
+@pytest.mark.asyncio
+async def test_challenge_pool_respects_refresh_interval(managers):
+    funds_flow, _ = managers
+    pool = ChallengePool(*managers)
+
+    await pool.refresh(refresh_interval=3600)
+    calls = funds_flow.calls
+    await pool.refresh(refresh_interval=3600)
+    assert funds_flow.calls == calls
+
+    await pool.refresh(refresh_interval=0)
+    assert funds_flow.calls == calls * 2
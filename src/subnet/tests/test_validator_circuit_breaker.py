@@ -0,0 +1,22 @@
+from src.subnet.validator.circuit_breaker import MinerCircuitBreaker, CIRCUIT_CLOSED, CIRCUIT_OPEN, CIRCUIT_HALF_OPEN
+
+
+def test_circuit_opens_after_consecutive_failures_and_probes_after_interval():
+    breaker = MinerCircuitBreaker()
+
+    breaker.record_failure("miner-1", failure_threshold=2)
+    assert breaker.state("miner-1") == CIRCUIT_CLOSED and breaker.allow("miner-1", open_interval=60)
+
+    breaker.record_failure("miner-1", failure_threshold=2)
+    assert breaker.state("miner-1") == CIRCUIT_OPEN
+    assert not breaker.allow("miner-1", open_interval=60)
+
+    assert breaker.allow("miner-1", open_interval=0)
+    assert breaker.state("miner-1") == CIRCUIT_HALF_OPEN
+
+    breaker.record_failure("miner-1", failure_threshold=2)
+    assert breaker.state("miner-1") == CIRCUIT_OPEN
+
+    assert breaker.allow("miner-1", open_interval=0)
+    breaker.record_success("miner-1")
+    assert breaker.state("miner-1") == CIRCUIT_CLOSED and breaker.open_count() == 0
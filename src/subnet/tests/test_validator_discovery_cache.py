@@ -0,0 +1,31 @@
+from src.subnet.protocol import Discovery, NETWORK_BITCOIN
+from src.subnet.validator.discovery_cache import DiscoveryCache
+
+DISCOVERY = Discovery(network=NETWORK_BITCOIN, version=1.0, graph_db='neo4j')
+ADDRESS = ('10.0.0.1', 8000)
+
+
+def test_discovery_cache_expires_and_tracks_address():
+    cache = DiscoveryCache()
+    cache.put('miner-1', ADDRESS, DISCOVERY)
+
+    assert cache.get('miner-1', ADDRESS, ttl=600) == DISCOVERY
+    assert cache.get('miner-1', ADDRESS, ttl=0) is None
+
+    cache.put('miner-1', ADDRESS, DISCOVERY)
+    assert cache.get('miner-1', ('10.0.0.2', 8000), ttl=600) is None
+
+
+def test_discovery_cache_full_refresh_and_invalidate():
+    cache = DiscoveryCache()
+    cache.put('miner-1', ADDRESS, DISCOVERY)
+    cache.put('miner-2', ADDRESS, DISCOVERY)
+
+    cache.invalidate('miner-1')
+    assert len(cache) == 1
+
+    cache.start_round(full_refresh_interval=0)
+    assert len(cache) == 1
+    cache._cleared_at -= 10
+    cache.start_round(full_refresh_interval=5)
+    assert len(cache) == 0
@@ -0,0 +1,27 @@
+import json
+
+from src.subnet.validator.encryption import canonical_loads, generate_response_hash
+
+
+def test_response_hash_ignores_key_order_and_number_formatting():
+    first = canonical_loads('{"response": [{"address": "a1", "balance": 10.0, "ratio": 0.30000000000000004}], "total": 3}')
+    second = canonical_loads('{"total": 3.0, "response": [{"ratio": 0.3, "balance": 10, "address": "a1"}]}')
+
+    assert generate_response_hash(first) == generate_response_hash(second)
+    assert generate_response_hash(first) != generate_response_hash({**second, 'total': 4})
+    assert len(generate_response_hash(first)) == 64
+
+
+def test_canonical_loads_keeps_the_payload_as_sent():
+    text = '{"balance": 10.0, "ratio": 0.30000000000000004}'
+
+    assert json.dumps(canonical_loads(text)) == text
+
+
+def test_response_hash_handles_integers_beyond_64_bits():
+    big_int = canonical_loads(f'{{"response": [{2 ** 64}, 1.5]}}')
+    big_float = canonical_loads('{"response": [1.8446744073709552e19, 1.5]}')
+
+    assert generate_response_hash(big_int) == generate_response_hash(canonical_loads('{"response": [18446744073709551616, 1.50]}'))
+    assert generate_response_hash(big_float) == generate_response_hash(big_int)
+    assert len(generate_response_hash(canonical_loads('{"response": [1e20, 1.5e300]}'))) == 64
@@ -0,0 +1,144 @@
+import asyncio
+import time
+
+import pytest
+from communex.errors import NetworkTimeoutError
+
+from src.subnet.protocol import MODEL_KIND_FUNDS_FLOW
+from src.subnet.validator.circuit_breaker import CIRCUIT_CLOSED, CIRCUIT_OPEN
+from src.subnet.tests.conftest import FakeModuleClients, make_prepared_round, make_settings
+
+
+async def answering_miner(fn, miner_key, params, timeout):
+    challenge = params['challenge']
+    if challenge['model_kind'] == MODEL_KIND_FUNDS_FLOW:
+        return {**challenge, 'output': {'tx_id': 'tx-1'}}
+    return {**challenge, 'output': {'balance': 42}}
+
+
+async def timing_out_miner(fn, miner_key, params, timeout):
+    raise NetworkTimeoutError(f"The call took longer than the timeout of {timeout} second(s)")
+
+
+@pytest.mark.asyncio
+async def test_challenge_timeouts_trip_the_circuit_breaker(validator):
+    validator.module_clients = FakeModuleClients(timing_out_miner)
+    settings = make_settings(CIRCUIT_FAILURE_THRESHOLD=1)
+
+    await validator.execute_round(make_prepared_round([1]), settings)
+
+    assert validator.circuit_breaker.state('miner-1') == CIRCUIT_OPEN
+    assert validator.weight_submitter.submissions[-1] == {1: 0}
+
+
+@pytest.mark.asyncio
+async def test_answering_miners_keep_their_circuit_closed_and_are_scored(validator):
+    validator.module_clients = FakeModuleClients(answering_miner)
+    settings = make_settings(CIRCUIT_FAILURE_THRESHOLD=1)
+
+    await validator.execute_round(make_prepared_round([1, 2]), settings)
+
+    assert validator.circuit_breaker.state('miner-1') == CIRCUIT_CLOSED
+    assert validator.circuit_breaker.open_count() == 0
+    assert set(validator.weight_submitter.submissions[-1]) == {1, 2}
+    assert all(score > 0 for score in validator.weight_submitter.submissions[-1].values())
+    assert sorted(validator.miner_discovery_manager.challenges) == [('miner-1', 0, 2), ('miner-2', 0, 2)]
+
+
+@pytest.mark.asyncio
+async def test_malformed_pool_challenge_skips_the_miner_without_tripping_its_circuit(validator):
+    called = []
+
+    async def miner(fn, miner_key, params, timeout):
+        called.append(miner_key)
+        return await answering_miner(fn, miner_key, params, timeout)
+
+    validator.module_clients = FakeModuleClients(miner)
+    settings = make_settings(CIRCUIT_FAILURE_THRESHOLD=1)
+    prepared = make_prepared_round([1, 2])
+    prepared.plan.assignments[1][MODEL_KIND_FUNDS_FLOW] = ('{"model_kind": "funds_flow", "in_total_amount": ', 'tx-1')
+
+    await validator.execute_round(prepared, settings)
+
+    assert called == ['miner-2', 'miner-2']
+    assert validator.circuit_breaker.state('miner-1') == CIRCUIT_CLOSED
+    assert validator.miner_discovery_manager.challenges == [('miner-2', 0, 2)]
+
+
+@pytest.mark.asyncio
+async def test_unchanged_metadata_is_skipped_and_deleted_rows_are_restored(validator):
+    validator.module_clients = FakeModuleClients(answering_miner)
+    discovery_manager = validator.miner_discovery_manager
+    settings = make_settings()
+
+    await validator.execute_round(make_prepared_round([1, 2]), settings)
+    await validator.execute_round(make_prepared_round([1, 2]), settings)
+    del discovery_manager.rows['miner-2']
+    await validator.execute_round(make_prepared_round([1, 2]), settings)
+
+    stored_keys = [sorted(row['miner_key'] for row in rows) for rows in discovery_manager.stored_metadata if rows]
+    assert stored_keys == [['miner-1', 'miner-2'], ['miner-2']]
+    assert set(discovery_manager.rows) == {'miner-1', 'miner-2'}
+    # the third round's challenges miss the deleted row and are applied again once it is restored
+    assert discovery_manager.challenges.count(('miner-2', 0, 2)) == 4
+
+
+@pytest.mark.asyncio
+async def test_challenge_kinds_run_concurrently_under_one_deadline(validator):
+    calls = {}
+
+    async def slow_miner(fn, miner_key, params, timeout):
+        calls[params['challenge']['model_kind']] = (time.monotonic(), timeout)
+        await asyncio.sleep(0.3)
+        return await answering_miner(fn, miner_key, params, timeout)
+
+    validator.module_clients = FakeModuleClients(slow_miner)
+
+    started = time.monotonic()
+    await validator.execute_round(make_prepared_round([1]), make_settings())
+
+    assert time.monotonic() - started < 0.55
+    assert len(calls) == 2
+    # both calls were sent at once and their timeouts run out at the same moment
+    (first_at, first_timeout), (second_at, second_timeout) = calls.values()
+    assert abs(first_at - second_at) < 0.05
+    assert abs((first_at + first_timeout) - (second_at + second_timeout)) < 0.01
+    assert 0 < first_timeout <= validator.challenge_timeout
+    assert validator.miner_discovery_manager.challenges == [('miner-1', 0, 2)]
+
+
+@pytest.mark.asyncio
+async def test_round_persists_all_miners_with_one_bulk_write_each(validator):
+    discovery_manager = validator.miner_discovery_manager
+    writes = []
+    for name in ('store_miners_metadata', 'update_miners_challenges', 'update_miners_ranks'):
+        def recording(rows, write=getattr(discovery_manager, name), name=name):
+            writes.append((name, len(rows)))
+            return write(rows)
+        setattr(discovery_manager, name, recording)
+    validator.module_clients = FakeModuleClients(answering_miner)
+
+    await validator.execute_round(make_prepared_round([1, 2, 3]), make_settings())
+
+    assert writes == [('store_miners_metadata', 3), ('update_miners_challenges', 3), ('update_miners_ranks', 3)]
+    assert set(discovery_manager.rows) == {'miner-1', 'miner-2', 'miner-3'}
+
+
+@pytest.mark.asyncio
+async def test_fast_miners_are_persisted_before_slow_ones_answer(validator):
+    discovery_manager = validator.miner_discovery_manager
+    stored_before_slow_answer = []
+
+    async def uneven_miner(fn, miner_key, params, timeout):
+        if miner_key == 'miner-2':
+            await asyncio.sleep(0.2)
+            stored_before_slow_answer.extend(discovery_manager.rows)
+        return await answering_miner(fn, miner_key, params, timeout)
+
+    validator.module_clients = FakeModuleClients(uneven_miner)
+
+    await validator.execute_round(make_prepared_round([2, 1]), make_settings(MINER_RESULTS_BATCH_SIZE=1))
+
+    assert 'miner-1' in stored_before_slow_answer
+    stored_keys = [[row['miner_key'] for row in rows] for rows in discovery_manager.stored_metadata if rows]
+    assert stored_keys == [['miner-1'], ['miner-2']]
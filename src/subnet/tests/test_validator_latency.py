@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from src.subnet.protocol import MODEL_KIND_FUNDS_FLOW, NETWORK_BITCOIN
+from src.subnet.tests.conftest import FakeModuleClients, make_miner
+from src.subnet.validator.latency import LatencyHistogram, LatencyRecorder, LATENCY_ENDPOINT_QUERY
+
+
+def test_latency_histogram_percentiles_use_bucket_bounds():
+    histogram = LatencyHistogram()
+    for seconds in [0.005] * 8 + [0.2, 120]:
+        histogram.observe(seconds)
+
+    assert histogram.percentile(0.5) == 10
+    assert histogram.percentile(0.9) == 250
+    assert histogram.percentile(0.99) == float('inf')
+    assert histogram.to_dict()['p99_ms'] is None
+    assert histogram.to_dict()['buckets']['inf'] == 1
+
+
+def test_latency_recorder_measures_failures_and_drains_window():
+    recorder = LatencyRecorder()
+
+    with recorder.measure("miner-1", LATENCY_ENDPOINT_QUERY):
+        pass
+    with pytest.raises(TimeoutError):
+        with recorder.measure("miner-1", LATENCY_ENDPOINT_QUERY):
+            raise TimeoutError()
+
+    # the failure is only counted, its elapsed time stays out of the buckets
+    [summary] = recorder.summary(miner_key="miner-1")
+    assert summary['count'] == 1 and summary['error_count'] == 1
+    assert sum(summary['buckets'].values()) == 1
+    assert recorder.due(0)
+
+    _, _, window = recorder.drain()
+    assert window[("miner-1", LATENCY_ENDPOINT_QUERY)].count == 1
+    assert window[("miner-1", LATENCY_ENDPOINT_QUERY)].error_count == 1
+    assert not recorder.due(0)
+    assert recorder.percentile("miner-1", LATENCY_ENDPOINT_QUERY, 0.5) == 10
+
+
+class RecordingLatencyManager:
+    def __init__(self):
+        self.rollups = []
+
+    async def store_latency_rollup(self, window_start, window_end, histograms):
+        self.rollups.append(histograms)
+
+
+@pytest.mark.asyncio
+async def test_queries_leave_rollup_to_the_background_loop(validator):
+    async def miner(fn, miner_key, params, timeout):
+        return {'response': [1]}
+
+    validator.miner_discovery_manager.miners = [make_miner(1)]
+    validator.module_clients = FakeModuleClients(miner)
+    validator.miner_latency_manager = RecordingLatencyManager()
+    validator.latency_rollup_interval = 0.01
+
+    for _ in range(2):
+        await validator.query_miner(NETWORK_BITCOIN, MODEL_KIND_FUNDS_FLOW, 'MATCH (a) RETURN a', miner_key='miner-1')
+        await asyncio.sleep(0.02)
+    assert validator.miner_latency_manager.rollups == []
+
+    rollup = asyncio.create_task(validator.latency_rollup_loop())
+    await asyncio.sleep(0.05)
+    validator.terminate_event.set()
+    await asyncio.wait_for(rollup, 1)
+
+    [histograms] = validator.miner_latency_manager.rollups
+    assert histograms[('miner-1', LATENCY_ENDPOINT_QUERY)]['count'] == 2
@@ -0,0 +1,41 @@
+import threading
+
+import pytest
+
+import src.subnet.validator.metagraph as metagraph
+from src.subnet.validator.metagraph import MetagraphService
+
+
+class FakeCommuneClient:
+    def __init__(self):
+        self.emissions = {1: 10, 2: 20}
+        self.addresses = {1: "10.0.0.1:8000", 2: "None:8001", 3: "not an address"}
+
+    def query_map_address(self, netuid):
+        return dict(self.addresses)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = FakeCommuneClient()
+    monkeypatch.setattr(metagraph, "get_map_modules", lambda c, netuid, include_balances: {
+        f"miner-{uid}": {"uid": uid, "key": f"miner-{uid}", "emission": emission} for uid, emission in c.emissions.items()
+    })
+    return client
+
+
+@pytest.mark.asyncio
+async def test_metagraph_snapshot_is_read_only_and_diffs_changes(client):
+    service = MetagraphService(client, 20, refresh_interval=60, terminate_event=threading.Event())
+
+    first = await service.get_snapshot()
+    assert dict(first.miners) == {1: (("10.0.0.1", "8000"), first.modules["miner-1"]), 2: (("0.0.0.0", "8001"), first.modules["miner-2"])}
+    assert first.diff(None) == {1, 2}
+    with pytest.raises(TypeError):
+        first.modules["miner-1"]["emission"] = 0
+
+    assert await service.get_snapshot() is first
+
+    client.emissions[2] = 25
+    second = service.refresh()
+    assert second.diff(first) == {2}
@@ -0,0 +1,118 @@
+import asyncio
+import functools
+import time
+
+import pytest
+
+from src.subnet.validator.miner_scheduler import MinerChallengeScheduler
+
+
+@pytest.mark.asyncio
+async def test_scheduler_caps_concurrency_and_yields_all_results():
+    scheduler = MinerChallengeScheduler()
+    in_flight = 0
+    peak = 0
+
+    async def job(uid):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return uid * 10
+
+    jobs = {uid: functools.partial(job, uid) for uid in range(20)}
+    results = {uid: result async for uid, result in scheduler.run(jobs, max_concurrency=4)}
+
+    assert peak == 4
+    assert results == {uid: uid * 10 for uid in range(20)}
+
+
+@pytest.mark.asyncio
+async def test_scheduler_scores_slow_and_failing_miners_as_none():
+    scheduler = MinerChallengeScheduler()
+
+    async def slow():
+        await asyncio.sleep(1)
+        return "late"
+
+    async def failing():
+        raise RuntimeError("miner down")
+
+    async def fast():
+        return "ok"
+
+    jobs = {1: slow, 2: failing, 3: fast}
+    completed = [item async for item in scheduler.run(jobs, max_concurrency=3, timeout=0.05)]
+
+    assert completed[-1] == (1, None)
+    assert dict(completed) == {1: None, 2: None, 3: "ok"}
+
+
+@pytest.mark.asyncio
+async def test_scheduler_cuts_off_stragglers_at_round_deadline():
+    scheduler = MinerChallengeScheduler()
+    cancelled = []
+
+    async def straggler():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def fast():
+        return "ok"
+
+    jobs = {1: straggler, 2: fast}
+    completed = [item async for item in scheduler.run(jobs, max_concurrency=2, deadline=time.monotonic() + 0.05)]
+
+    assert completed == [(2, "ok")]
+    assert cancelled == [True]
+
+
+def test_scheduler_rotates_start_order_between_rounds():
+    scheduler = MinerChallengeScheduler()
+    keys = list(range(6))
+
+    assert scheduler._fair_order(keys, 2) == [0, 1, 2, 3, 4, 5]
+    assert scheduler._fair_order(keys, 2) == [2, 3, 4, 5, 0, 1]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_yields_finished_results_to_a_slow_consumer_after_deadline():
+    scheduler = MinerChallengeScheduler()
+
+    async def job(uid):
+        await asyncio.sleep(0.01)
+        return uid
+
+    jobs = {uid: functools.partial(job, uid) for uid in range(4)}
+    yielded = []
+    async for uid, _ in scheduler.run(jobs, max_concurrency=4, deadline=time.monotonic() + 0.1):
+        yielded.append(uid)
+        await asyncio.sleep(0.2)
+
+    assert sorted(yielded) == [0, 1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_starts_nothing_and_yields_nothing_finished_after_deadline():
+    scheduler = MinerChallengeScheduler()
+    started = []
+
+    async def job(uid):
+        started.append(uid)
+        await asyncio.sleep(0.06)
+        return uid
+
+    # two workers: uids 0 and 1 finish before the deadline, 2 and 3 would finish after it
+    jobs = {uid: functools.partial(job, uid) for uid in range(6)}
+    yielded = []
+    async for uid, _ in scheduler.run(jobs, max_concurrency=2, deadline=time.monotonic() + 0.1):
+        yielded.append(uid)
+        # a consumer busy writing a batch while the workers carry on
+        await asyncio.sleep(0.3)
+
+    assert sorted(yielded) == [0, 1]
+    assert sorted(started) == [0, 1, 2, 3]
@@ -0,0 +1,35 @@
+import random
+
+from src.subnet.validator.latency import LATENCY_ENDPOINT_QUERY, LatencyRecorder
+from src.subnet.validator.miner_selection import MinerSelectionStats, PowerOfTwoSelectionPolicy, \
+    RandomSelectionPolicy
+
+
+def make_miner(key, failed=0, total=10):
+    return {'miner_key': key, 'failed_challenges': failed, 'total_challenges': total}
+
+
+def test_power_of_two_prefers_fast_reliable_idle_miners():
+    stats = MinerSelectionStats(LatencyRecorder())
+    stats.latency.observe('fast', LATENCY_ENDPOINT_QUERY, 0.02)
+    stats.latency.observe('slow', LATENCY_ENDPOINT_QUERY, 2.0)
+    policy = PowerOfTwoSelectionPolicy(exploration_rate=0, rng=random.Random(0))
+
+    assert policy.select([make_miner('slow'), make_miner('fast')], 1, stats)[0]['miner_key'] == 'fast'
+    assert policy.select([make_miner('fast', failed=9), make_miner('fast')], 1, stats)[0]['failed_challenges'] == 0
+
+    with stats.track('fast'), stats.track('fast'):
+        assert stats.in_flight['fast'] == 2
+    assert 'fast' not in stats.in_flight
+
+
+def test_selection_policies_never_repeat_miners():
+    stats = MinerSelectionStats(LatencyRecorder())
+    miners = [make_miner(f'miner-{i}') for i in range(20)]
+
+    for policy in (RandomSelectionPolicy(rng=random.Random(1)), PowerOfTwoSelectionPolicy(rng=random.Random(1))):
+        selected = policy.select(miners, 3, stats)
+        assert len({miner['miner_key'] for miner in selected}) == 3
+        assert len(policy.select(miners[:2], 3, stats)) == 2
+
+    assert all(miner in miners[:16] for miner in RandomSelectionPolicy().select(miners, 3, stats))
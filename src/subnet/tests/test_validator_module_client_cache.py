@@ -0,0 +1,86 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from substrateinterface import Keypair
+
+from src.subnet.protocol import Challenge, MODEL_KIND_FUNDS_FLOW
+from src.subnet.tests.conftest import FUNDS_FLOW_CHALLENGE, FakeModuleClient
+from src.subnet.validator.module_client_cache import MIN_CALL_TIMEOUT, ModuleClientCache, PersistentModuleClient
+
+
+@pytest.mark.asyncio
+async def test_module_client_cache_reuses_and_invalidates_clients():
+    cache = ModuleClientCache(Keypair.create_from_uri('//Alice'), idle_timeout=300)
+
+    client = await cache.get('10.0.0.1', 8000, 'miner-1')
+    assert await cache.get('10.0.0.1', '8000', 'miner-1') is client
+
+    moved = await cache.get('10.0.0.2', 8000, 'miner-1')
+    assert moved is not client and len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_module_client_cache_keeps_a_moved_address_other_keys_still_use():
+    cache = ModuleClientCache(Keypair.create_from_uri('//Alice'), idle_timeout=300)
+
+    shared = await cache.get('0.0.0.0', 8000, 'miner-1')
+    assert await cache.get('0.0.0.0', 8000, 'miner-2') is shared
+
+    await cache.get('10.0.0.2', 8000, 'miner-1')
+    assert await cache.get('0.0.0.0', 8000, 'miner-2') is shared and len(cache) == 2
+
+    await cache.get('10.0.0.3', 8000, 'miner-2')
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_module_client_cache_evicts_idle_clients():
+    cache = ModuleClientCache(Keypair.create_from_uri('//Alice'), idle_timeout=0)
+
+    await cache.get('10.0.0.1', 8000)
+    await cache.get('10.0.0.2', 8000)
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_client_used_from_another_loop_closes_its_previous_session():
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+    thread.start()
+    client = PersistentModuleClient('10.0.0.1', 8000, Keypair.create_from_uri('//Alice'))
+
+    async def get_session():
+        return client._get_session()
+
+    try:
+        previous = asyncio.run_coroutine_threadsafe(get_session(), other_loop).result(1)
+        current = client._get_session()
+        for _ in range(100):
+            if previous.closed:
+                break
+            await asyncio.sleep(0.01)
+
+        assert previous.closed and current is not previous and not current.closed
+        await client.close()
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join(1)
+        other_loop.close()
+
+
+@pytest.mark.asyncio
+async def test_challenge_past_its_deadline_still_gets_a_positive_timeout(validator):
+    timeouts = []
+
+    async def miner(fn, miner_key, params, timeout):
+        timeouts.append(timeout)
+        return {**params['challenge'], 'output': {'tx_id': 'tx-1'}}
+
+    output, reachable = await validator._execute_challenge(
+        FakeModuleClient(miner), 'miner-1', MODEL_KIND_FUNDS_FLOW, Challenge.model_validate_json(FUNDS_FLOW_CHALLENGE[0]), time.monotonic() - 1
+    )
+
+    assert timeouts == [MIN_CALL_TIMEOUT]
+    assert (output, reachable) == ('tx-1', True)
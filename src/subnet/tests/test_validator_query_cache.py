@@ -0,0 +1,77 @@
+from datetime import datetime
+
+import pytest
+
+from src.subnet.validator.chain_tip import ChainTipCache
+from src.subnet.validator.query_cache import QueryResultCache, cache_headers
+from src.subnet.protocol import MODEL_KIND_FUNDS_FLOW, NETWORK_BITCOIN
+
+
+@pytest.mark.asyncio
+async def test_query_cache_normalizes_queries_and_sets_headers():
+    cache = QueryResultCache(ttl=30, finalized_ttl=3600)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return {'verified': True, 'response': [{'block_height': 1}], 'request_id': 'miss', 'timestamp': datetime(2024, 1, 1)}
+
+    first = await cache.get_or_query(NETWORK_BITCOIN, MODEL_KIND_FUNDS_FLOW, "MATCH (a)\n  RETURN a", fetch, finalized=True)
+    second = await cache.get_or_query(NETWORK_BITCOIN, MODEL_KIND_FUNDS_FLOW, "MATCH (a) RETURN a", fetch, finalized=True)
+    third = await cache.get_or_query(NETWORK_BITCOIN, MODEL_KIND_FUNDS_FLOW, "MATCH (a) RETURN a", fetch, finalized=True)
+
+    assert len(calls) == 1
+    assert cache_headers(first) == {'X-Cache': 'MISS', 'Cache-Control': 'public, max-age=3600'}
+    assert cache_headers(second)['X-Cache'] == 'HIT'
+    # a hit carries the cached result but identifies its own request
+    assert {key: second[key] for key in ('verified', 'response')} == {'verified': True, 'response': [{'block_height': 1}]}
+    assert len({first['request_id'], second['request_id'], third['request_id']}) == 3
+    assert second['timestamp'] > first['timestamp']
+
+
+@pytest.mark.asyncio
+async def test_query_cache_skips_empty_results_and_evicts_least_recent():
+    cache = QueryResultCache(max_entries=2, ttl=30)
+
+    async def fetch_empty():
+        return {'verified': False, 'response': []}
+
+    async def fetch_result():
+        return {'verified': False, 'response': [1]}
+
+    empty = await cache.get_or_query(NETWORK_BITCOIN, MODEL_KIND_FUNDS_FLOW, 'q0', fetch_empty)
+    for query in ('q1', 'q2', 'q3'):
+        await cache.get_or_query(NETWORK_BITCOIN, MODEL_KIND_FUNDS_FLOW, query, fetch_result)
+
+    assert cache_headers(empty) == {'X-Cache': 'MISS', 'Cache-Control': 'no-store'}
+    assert len(cache._local) == 2
+    assert cache._get_local(cache.cache_key(NETWORK_BITCOIN, MODEL_KIND_FUNDS_FLOW, 'q1')) is None
+
+
+@pytest.mark.asyncio
+async def test_query_cache_only_treats_blocks_confirmed_below_the_tip_as_finalized():
+    tips = {NETWORK_BITCOIN: 100}
+    cache = QueryResultCache(ttl=30, finalized_ttl=3600, chain_tip=ChainTipCache({NETWORK_BITCOIN: lambda: tips[NETWORK_BITCOIN]}))
+
+    async def fetch():
+        return {'verified': True, 'response': [{'block_height': 1}]}
+
+    confirmed = await cache.get_or_query(NETWORK_BITCOIN, MODEL_KIND_FUNDS_FLOW, 'q0', fetch, block_heights=[90, 94])
+    near_tip = await cache.get_or_query(NETWORK_BITCOIN, MODEL_KIND_FUNDS_FLOW, 'q1', fetch, block_heights=[94, 95])
+    past_tip = await cache.get_or_query(NETWORK_BITCOIN, MODEL_KIND_FUNDS_FLOW, 'q2', fetch, block_heights=[99, 100, 101])
+    unpinned = await cache.get_or_query(NETWORK_BITCOIN, MODEL_KIND_FUNDS_FLOW, 'q3', fetch)
+
+    assert cache_headers(confirmed)['Cache-Control'] == 'public, max-age=3600'
+    for data in (near_tip, past_tip, unpinned):
+        assert cache_headers(data)['Cache-Control'] == 'public, max-age=30'
+
+
+@pytest.mark.asyncio
+async def test_chain_tip_unknown_height_finalizes_nothing():
+    def unreachable():
+        raise ConnectionError("node down")
+
+    chain_tip = ChainTipCache({NETWORK_BITCOIN: unreachable})
+
+    assert await chain_tip.is_final(NETWORK_BITCOIN, [1]) is False
+    assert await chain_tip.is_final('unknown', [1]) is False
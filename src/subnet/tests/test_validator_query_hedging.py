@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+import pytest
+
+from src.subnet.protocol import MODEL_KIND_FUNDS_FLOW, NETWORK_BITCOIN
+from src.subnet.tests.conftest import FakeModuleClients, make_miner
+from src.subnet.validator.latency import LATENCY_ENDPOINT_QUERY
+
+
+def hedging_miner(delays: dict, called_at: dict):
+    async def miner(fn, miner_key, params, timeout):
+        called_at[miner_key] = time.perf_counter()
+        await asyncio.sleep(delays[miner_key])
+        return {'response': [{'block_height': 1}]}
+    return miner
+
+
+@pytest.mark.asyncio
+async def test_hedged_query_adds_reserve_miner_after_network_p90_and_censors_the_cancelled_one(validator):
+    called_at = {}
+    validator.query_hedging = True
+    validator.miner_discovery_manager.miners = [make_miner(uid) for uid in (1, 2, 3)]
+    validator.module_clients = FakeModuleClients(hedging_miner({'miner-1': 0.0, 'miner-2': 0.5, 'miner-3': 0.0}, called_at))
+    # only miner-1 has history, the network wide p90 still hedges queries to miners without any
+    validator.latency.observe('miner-1', LATENCY_ENDPOINT_QUERY, 0.04, group=(NETWORK_BITCOIN, MODEL_KIND_FUNDS_FLOW))
+
+    started = time.perf_counter()
+    result = await validator.query_miner(NETWORK_BITCOIN, MODEL_KIND_FUNDS_FLOW, 'MATCH (a) RETURN a', miner_key=None)
+
+    # the reserve only goes out once the network's p90 (the 50ms bucket) passed without a match
+    assert called_at['miner-3'] - started >= 0.05
+    assert result['verified'] is True
+    assert result['verifying_miners'] == ['miner-1', 'miner-3']
+    # the slow miner was cancelled by the match: counted as censored, never bucketed as fast
+    slow = validator.latency.summary('miner-2', LATENCY_ENDPOINT_QUERY)[0]
+    assert slow['count'] == 0 and slow['censored_count'] == 1
+    assert validator.latency.percentile('miner-2', LATENCY_ENDPOINT_QUERY, 0.9) is None
+    assert validator.latency.group_percentile((NETWORK_BITCOIN, MODEL_KIND_FUNDS_FLOW), 0.9) == 50
+
+
+@pytest.mark.asyncio
+async def test_hedged_query_queries_every_miner_up_front_without_observations(validator):
+    called_at = {}
+    validator.query_hedging = True
+    validator.miner_discovery_manager.miners = [make_miner(uid) for uid in (1, 2, 3)]
+    validator.module_clients = FakeModuleClients(hedging_miner({'miner-1': 0.2, 'miner-2': 0.2, 'miner-3': 0.2}, called_at))
+
+    started = time.perf_counter()
+    result = await validator.query_miner(NETWORK_BITCOIN, MODEL_KIND_FUNDS_FLOW, 'MATCH (a) RETURN a', miner_key=None)
+
+    assert result['verified'] is True
+    assert sorted(called_at) == ['miner-1', 'miner-2', 'miner-3']
+    assert max(called_at.values()) - started < 0.1
+
+
+@pytest.mark.asyncio
+async def test_failed_queries_are_left_out_of_latency(validator):
+    async def miner(fn, miner_key, params, timeout):
+        raise ConnectionError("refused")
+
+    validator.miner_discovery_manager.miners = [make_miner(1)]
+    validator.module_clients = FakeModuleClients(miner)
+
+    await validator.query_miner(NETWORK_BITCOIN, MODEL_KIND_FUNDS_FLOW, 'MATCH (a) RETURN a', miner_key='miner-1')
+
+    assert validator.latency.percentile('miner-1', LATENCY_ENDPOINT_QUERY, 0.5) is None
+    [summary] = validator.latency.summary('miner-1', LATENCY_ENDPOINT_QUERY)
+    assert summary['count'] == 0 and summary['error_count'] == 1
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from src.subnet.protocol import MODEL_KIND_FUNDS_FLOW, NETWORK_BITCOIN
+from src.subnet.tests.conftest import FakeModuleClients, make_miner
+
+
+@pytest.mark.asyncio
+async def test_single_miner_query_returns_payload_as_sent_and_hashes_big_integers(validator):
+    async def miner(fn, miner_key, params, timeout):
+        return [{'response_json': {'balance': 10.0, 'supply': 2 ** 64}}]
+
+    validator.miner_discovery_manager.miners = [make_miner(1)]
+    validator.module_clients = FakeModuleClients(miner)
+
+    result = await validator.query_miner(NETWORK_BITCOIN, MODEL_KIND_FUNDS_FLOW, 'MATCH (a) RETURN a', miner_key='miner-1')
+
+    assert result['response'] == {'balance': 10.0, 'supply': 2 ** 64}
+    assert isinstance(result['response']['balance'], float)
+    assert result['response_hash'] is not None
+    assert len(validator.miner_receipt_manager.receipts) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_queries_share_one_fan_out(validator):
+    calls = []
+
+    async def miner(fn, miner_key, params, timeout):
+        calls.append(miner_key)
+        await asyncio.sleep(0.05)
+        return {'response': [{'block_height': 1}]}
+
+    validator.miner_discovery_manager.miners = [make_miner(uid) for uid in (1, 2, 3)]
+    validator.module_clients = FakeModuleClients(miner)
+
+    async def query():
+        return await validator.query_miner(NETWORK_BITCOIN, MODEL_KIND_FUNDS_FLOW, 'MATCH (a) RETURN a', miner_key=None)
+
+    callers = [asyncio.create_task(query()) for _ in range(10)]
+    await asyncio.sleep(0)
+    # a caller that goes away does not cancel the fan-out the others wait on
+    callers[0].cancel()
+    results = await asyncio.gather(*callers[1:])
+
+    assert sorted(calls) == ['miner-1', 'miner-2', 'miner-3']
+    assert all(result['verified'] for result in results)
+    assert len({result['request_id'] for result in results}) == 9
+    assert len(validator.miner_receipt_manager.receipts) == 2
+    assert validator._query_flights == {}
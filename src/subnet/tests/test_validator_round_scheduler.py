@@ -0,0 +1,53 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.subnet.validator.round_scheduler import RoundScheduler, TerminateEvent
+
+
+@pytest.mark.asyncio
+async def test_round_scheduler_keeps_a_fixed_rate():
+    terminate_event = TerminateEvent()
+    starts = []
+
+    scheduler = RoundScheduler(terminate_event, interval=0.1)
+    async for round_number in scheduler.ticks():
+        starts.append(time.monotonic())
+        await asyncio.sleep(0.05)
+        assert 0.03 < scheduler.seconds_until_next() <= 0.05
+        if round_number == 2:
+            terminate_event.set()
+
+    assert len(starts) == 3
+    assert 0.18 < starts[2] - starts[0] < 0.25
+
+
+@pytest.mark.asyncio
+async def test_round_scheduler_wakes_on_terminate_from_another_thread():
+    terminate_event = TerminateEvent()
+    threading.Timer(0.05, terminate_event.set).start()
+    ticker = asyncio.create_task(asyncio.sleep(0.01))
+
+    start = time.monotonic()
+    rounds = [round_number async for round_number in RoundScheduler(terminate_event, interval=60).ticks()]
+
+    assert rounds == [0] and time.monotonic() - start < 1
+    assert ticker.done()
+
+
+def test_terminate_event_can_be_set_while_its_lock_is_held_by_the_same_thread():
+    # what a SIGINT handler does when it interrupts wait_async() inside its locked section
+    terminate_event = TerminateEvent()
+
+    def interrupted_waiter():
+        with terminate_event._lock:
+            terminate_event.set()
+
+    thread = threading.Thread(target=interrupted_waiter, daemon=True)
+    thread.start()
+    thread.join(1)
+
+    assert not thread.is_alive()
+    assert terminate_event.is_set()
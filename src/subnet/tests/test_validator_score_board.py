@@ -0,0 +1,28 @@
+import time
+
+from src.subnet.validator.score_board import ScoreBoard
+
+
+def test_score_board_rotates_shards_across_restarts(tmp_path):
+    file_name = str(tmp_path / "score_board.pkl")
+    keys = [f"miner-{i}" for i in range(5)]
+
+    board = ScoreBoard(file_name)
+    assert board.next_shard(keys, 2) == ["miner-0", "miner-1"]
+    board.update({}, keys)
+
+    restarted = ScoreBoard(file_name)
+    assert restarted.next_shard(keys, 2) == ["miner-2", "miner-3"]
+    assert restarted.next_shard(keys, 2) == ["miner-4", "miner-0"]
+
+
+def test_score_board_decays_and_forgets_deregistered_miners(tmp_path):
+    board = ScoreBoard(str(tmp_path / "score_board.pkl"))
+    board.update({"miner-0": 0.8, "miner-1": 0.4}, ["miner-0", "miner-1"])
+    board._scores["miner-0"] = (0.8, time.time() - 100)
+
+    scores = board.decayed_scores(half_life=100)
+    assert abs(scores["miner-0"] - 0.4) < 0.01 and abs(scores["miner-1"] - 0.4) < 0.01
+
+    board.update({}, ["miner-1"])
+    assert set(board.decayed_scores(half_life=100)) == {"miner-1"}
@@ -0,0 +1,29 @@
+import pytest
+
+from src.subnet.protocol import NETWORK_BITCOIN, NETWORK_COMMUNE
+from src.subnet.validator.scoring_context import ScoringContext
+
+
+class FakeReceiptManager:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_receipts_count_by_networks(self):
+        self.calls += 1
+        return {NETWORK_BITCOIN: 30, NETWORK_COMMUNE: 10}
+
+    async def get_receipt_miner_multiplier(self, network=None, miner_key=None):
+        self.calls += 1
+        return [{'miner_key': 'miner-1', 'network': NETWORK_BITCOIN, 'multiplier': 0.25}]
+
+
+@pytest.mark.asyncio
+async def test_scoring_context_reads_receipts_once():
+    manager = FakeReceiptManager()
+    context = await ScoringContext.build(manager, lambda organic_usage: {network: float(count) for network, count in organic_usage.items()})
+
+    assert manager.calls == 2
+    assert context.multiplier(NETWORK_BITCOIN, 'miner-1') == 0.25
+    assert context.multiplier(NETWORK_COMMUNE, 'miner-1') == 1
+    assert context.multiplier(NETWORK_BITCOIN, 'miner-2') == 1
+    assert context.network_influence(NETWORK_BITCOIN) == 0.75
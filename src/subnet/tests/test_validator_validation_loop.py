@@ -0,0 +1,61 @@
+import asyncio
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from src.subnet.protocol import MODEL_KIND_FUNDS_FLOW, NETWORK_BITCOIN
+from src.subnet.tests.conftest import FakeModuleClients, make_settings, make_snapshot
+
+
+@pytest.mark.asyncio
+async def test_pipelined_rounds_keep_miner_calls_within_the_concurrency_cap(validator, monkeypatch):
+    # base weights are read relative to src, where the validator runs
+    monkeypatch.chdir(Path(__file__).parents[2])
+    in_flight = {'discovery': Counter(), 'challenge': Counter()}
+    peak = 0
+    overlapped = []
+
+    async def miner(fn, miner_key, params, timeout):
+        nonlocal peak
+        in_flight[fn][miner_key] += 1
+        busy_miners = {key for calls in in_flight.values() for key, count in calls.items() if count}
+        peak = max(peak, len(busy_miners))
+        if fn == 'discovery' and +in_flight['challenge']:
+            overlapped.append(miner_key)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            in_flight[fn][miner_key] -= 1
+        if fn == 'discovery':
+            return {'network': NETWORK_BITCOIN, 'version': 1.0, 'graph_db': 'neo4j'}
+        challenge = params['challenge']
+        if challenge['model_kind'] == MODEL_KIND_FUNDS_FLOW:
+            return {**challenge, 'output': {'tx_id': 'tx-1'}}
+        return {**challenge, 'output': {'balance': 42}}
+
+    snapshot = make_snapshot(validator, list(range(1, 7)))
+
+    async def get_snapshot():
+        return snapshot
+
+    executed = []
+    execute_round = validator.execute_round
+
+    async def counting_execute_round(prepared, settings, **kwargs):
+        await execute_round(prepared, settings, **kwargs)
+        executed.append(prepared)
+        if len(executed) == 3:
+            validator.terminate_event.set()
+
+    validator.metagraph.get_snapshot = get_snapshot
+    validator.module_clients = FakeModuleClients(miner)
+    validator.execute_round = counting_execute_round
+    settings = make_settings(PIPELINED_ROUNDS=True, MAX_CONCURRENT_MINERS=2, DISCOVERY_CACHE_TTL=0)
+
+    await asyncio.wait_for(validator.validation_loop(settings), timeout=10)
+
+    assert len(executed) == 3
+    assert peak <= settings.MAX_CONCURRENT_MINERS
+    assert overlapped == []
+    assert all(len(prepared.plan) == 6 for prepared in executed)
@@ -0,0 +1,47 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.subnet.validator.weight_submitter import WeightSubmitter
+
+
+@pytest.mark.asyncio
+async def test_weight_submitter_retries_failed_submissions():
+    submitter = WeightSubmitter()
+    attempts = []
+
+    def vote():
+        attempts.append(threading.current_thread().name)
+        if len(attempts) < 3:
+            raise RuntimeError("chain unavailable")
+        return "voted"
+
+    assert await submitter.submit(vote, retries=2) == "voted"
+    assert len(attempts) == 3 and attempts[0].startswith("weight-submitter")
+
+    with pytest.raises(ZeroDivisionError):
+        await submitter.submit(lambda: 1 / 0, retries=1)
+    submitter.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_weight_submitter_drops_superseded_submissions():
+    submitter = WeightSubmitter(max_pending=1)
+    started, release = threading.Event(), threading.Event()
+    votes = []
+
+    def in_flight():
+        started.set()
+        release.wait()
+
+    first = submitter.submit(in_flight)
+    started.wait()
+    second = submitter.submit(votes.append, 2)
+    third = submitter.submit(votes.append, 3)
+    release.set()
+
+    await first
+    await third
+    assert second.cancelled() and votes == [3]
+    submitter.shutdown()
@@ -47,15 +47,40 @@ class ValidatorSettings(BaseSettings):
     WORKERS: int = 4
 
     WEIGHTS_FILE_NAME: str = 'weights.pkl'
+    SCORE_BOARD_FILE_NAME: str = 'score_board.pkl'
     DATABASE_URL: str
     API_RATE_LIMIT: int
     REDIS_URL: str
+    QUERY_CACHE_MAX_ENTRIES: int = 1024  # query results kept in each gateway worker's in-process cache
+    QUERY_CACHE_TTL: int = 30  # seconds a query result is cached, 0 disables caching of unfinalized results
+    QUERY_CACHE_FINALIZED_TTL: int = 3600  # seconds a verified result over finalized blocks is cached
 
     QUERY_TIMEOUT: int   # cross check query timeout
     CHALLENGE_TIMEOUT: int  # challenge and llm challenge time
+    QUERY_HEDGING: bool = False  # query two miners and add a third only when no match arrives within the p90 latency
+    QUERY_SELECTION_POLICY: str = 'random'  # how query miners are picked: 'random' or 'power_of_two'
+    QUERY_EXPLORATION_RATE: float = 0.1  # share of power_of_two picks made uniformly at random
 
     CHALLENGE_FREQUENCY: int
     CHALLENGE_THRESHOLD: int
+    CHALLENGE_POOL_REFRESH_INTERVAL: int = 0  # seconds between challenge pool reloads, 0 reloads every round
+    CHALLENGE_WITH_REPLACEMENT: bool = True  # whether miners of one network may draw the same challenge in a round
+    MAX_CONCURRENT_MINERS: int = 32  # miners discovered or challenged at the same time
+    MINER_CHALLENGE_DEADLINE: Optional[int] = None  # seconds per miner before it is scored as failed, defaults to 1.5 * CHALLENGE_TIMEOUT
+    ROUND_DEADLINE: Optional[int] = None  # seconds for a round's discovery and challenges, outstanding miners are cut off and score zero
+    SHARD_SIZE: int = 0  # miners challenged per round, 0 challenges every miner every round
+    SHARD_SCORE_HALF_LIFE: int = 86400  # seconds for an unvisited miner's last sharded score to halve
+    PIPELINED_ROUNDS: bool = False  # prepare the next round only after the challenges, when it is due before a preparation would finish; overlaps just the last results write, rank update and rollup, so the cadence stays preparation plus execution
+    MINER_RESULTS_BATCH_SIZE: int = 16  # scored miners persisted together while the rest of the round finishes
+    CIRCUIT_FAILURE_THRESHOLD: int = 3  # consecutive unreachable rounds before a miner is skipped, 0 never skips
+    CIRCUIT_OPEN_INTERVAL: int = 1800  # seconds a skipped miner waits before it is probed again
+    DISCOVERY_CACHE_TTL: int = 600  # seconds a miner's discovery answer is reused, 0 asks every round
+    DISCOVERY_FULL_REFRESH_INTERVAL: int = 3600  # seconds between rediscovering every miner regardless of TTL
+    METAGRAPH_REFRESH_INTERVAL: int = 60  # seconds between background metagraph refreshes
+    MINER_CLIENT_IDLE_TIMEOUT: int = 300  # seconds before an unused miner connection is closed
+    LATENCY_ROLLUP_INTERVAL: int = 300  # seconds between writing latency histograms to miner_latencies
+    WEIGHT_SUBMISSION_RETRIES: int = 3  # extra attempts when setting weights fails
+    WEIGHT_SUBMISSION_RETRY_DELAY: int = 10  # seconds between weight submission attempts
 
     BITCOIN_NODE_RPC_URL: str
     COMMUNE_NODE_RPC: str
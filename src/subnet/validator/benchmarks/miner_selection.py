@@ -0,0 +1,122 @@
+"""
+Simulated comparison of query_miner selection policies: the original random sample of the first 16
+miners vs power-of-two-choices on latency, challenge success ratio and in-flight load.
+
+Miners are single-server FIFO queues with log-normal service times and a per-miner failure rate that
+also sets their challenge counters: a failing miner answers, but with a response no other miner shares.
+Queries arrive as a Poisson process and go to three miners each. As in query_miner, a query is verified
+when two responses match within the timeout, and the calls still running then are cancelled. Latency is
+recorded the way the validator records it: answered calls are observed once they complete and cancelled
+ones are only counted as censored, so policies never learn from a cut-off call's elapsed time. Cancelling
+a call does not stop the miner, which stays busy until it finishes. Both policies see the same miners and
+arrivals.
+
+Usage (from the repository root):
+    python -m src.subnet.validator.benchmarks.miner_selection --miners 64 --rate 20 --queries 20000
+"""
+import argparse
+import heapq
+import math
+import random
+import statistics
+
+from src.subnet.validator.latency import LATENCY_ENDPOINT_QUERY, LatencyRecorder
+from src.subnet.validator.miner_selection import MinerSelectionStats, get_selection_policy, \
+    SELECTION_POLICY_RANDOM, SELECTION_POLICY_POWER_OF_TWO
+
+SELECT_COUNT = 3
+CHALLENGES_PER_MINER = 100
+
+
+def build_miners(count: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    miners = []
+    for uid in range(count):
+        failure_rate = rng.uniform(0.0, 0.5)
+        miners.append({
+            'miner_key': f'miner-{uid}',
+            'median_ms': math.exp(rng.uniform(math.log(50), math.log(2000))),
+            'failure_rate': failure_rate,
+            'total_challenges': CHALLENGES_PER_MINER,
+            'failed_challenges': round(failure_rate * CHALLENGES_PER_MINER),
+        })
+    return miners
+
+
+def simulate(policy_name: str, miners: list[dict], rate: float, queries: int, timeout: float,
+             exploration_rate: float, seed: int) -> dict:
+    rng = random.Random(seed)
+    policy = get_selection_policy(policy_name, exploration_rate)
+    policy.rng = random.Random(seed + 1)
+    latency = LatencyRecorder()
+    stats = MinerSelectionStats(latency)
+
+    busy_until = {miner['miner_key']: 0.0 for miner in miners}
+    # (at, miner_key, seconds): an answered call observed after `seconds`, or a cancelled one when seconds is None
+    events = []
+    verify_times = []
+    now = 0.0
+
+    for _ in range(queries):
+        now += rng.expovariate(rate)
+        while events and events[0][0] <= now:
+            _, miner_key, seconds = heapq.heappop(events)
+            if seconds is None:
+                latency.observe_censored(miner_key, LATENCY_ENDPOINT_QUERY)
+            else:
+                latency.observe(miner_key, LATENCY_ENDPOINT_QUERY, seconds)
+            stats.in_flight[miner_key] -= 1
+
+        calls = []
+        for miner in policy.select(miners, SELECT_COUNT, stats):
+            miner_key = miner['miner_key']
+            service = rng.lognormvariate(math.log(miner['median_ms'] / 1000), 0.5)
+            finished_at = max(now, busy_until[miner_key]) + service
+            busy_until[miner_key] = finished_at
+            correct = rng.random() >= miner['failure_rate']
+            stats.in_flight[miner_key] += 1
+            calls.append((finished_at - now, miner_key, correct))
+
+        # responses are compared in completion order: the second correct one is the first match
+        calls.sort()
+        answered = [seconds for seconds, _, correct in calls if correct and seconds <= timeout]
+        if len(answered) >= 2:
+            ended = answered[1]
+            verify_times.append(ended * 1000)
+        else:
+            ended = min(timeout, calls[-1][0]) if calls else 0.0
+
+        for seconds, miner_key, _ in calls:
+            if seconds <= ended:
+                heapq.heappush(events, (now + seconds, miner_key, seconds))
+            else:
+                heapq.heappush(events, (now + ended, miner_key, None))
+
+    verify_times.sort()
+    return {
+        'verified': len(verify_times) / queries,
+        'p50': statistics.median(verify_times) if verify_times else float('nan'),
+        'p95': verify_times[int(len(verify_times) * 0.95) - 1] if verify_times else float('nan'),
+        'p99': verify_times[int(len(verify_times) * 0.99) - 1] if verify_times else float('nan'),
+    }
+
+
+def run(miner_count: int, rate: float, queries: int, timeout: float, exploration_rate: float, seed: int):
+    miners = build_miners(miner_count, seed)
+    print(f"{'policy':<16}{'verified':>10}{'p50 ms':>12}{'p95 ms':>12}{'p99 ms':>12}")
+    for policy_name in (SELECTION_POLICY_RANDOM, SELECTION_POLICY_POWER_OF_TWO):
+        result = simulate(policy_name, miners, rate, queries, timeout, exploration_rate, seed)
+        print(f"{policy_name:<16}{result['verified']:>10.1%}{result['p50']:>12.1f}{result['p95']:>12.1f}{result['p99']:>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark query miner selection policies in simulation")
+    parser.add_argument("--miners", type=int, default=64)
+    parser.add_argument("--rate", type=float, default=20.0, help="Queries per second")
+    parser.add_argument("--queries", type=int, default=20_000)
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds before a query counts as unverified")
+    parser.add_argument("--exploration-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    run(args.miners, args.rate, args.queries, args.timeout, args.exploration_rate, args.seed)
@@ -0,0 +1,199 @@
+"""
+Before/after query plans for the validator's hot queries, with and without the secondary indexes added
+by migration 020.
+
+Tables are seeded into temporary tables that shadow the real ones for the duration of the connection.
+The "before" plans are taken after dropping every non-unique secondary index of the shadow tables inside
+a savepoint, which is rolled back afterwards, so the real tables are never locked or modified.
+
+Usage (from the repository root, against a database migrated to head):
+    python -m src.subnet.validator.benchmarks.query_plans --database-url <url> --challenges 1000 --receipts 1000000
+"""
+import argparse
+import asyncio
+import json
+import os
+
+from sqlalchemy import text
+
+from src.subnet.protocol import get_networks
+from src.subnet.validator.database.session_manager import DatabaseSessionManager
+
+TABLES = ['challenges_funds_flow', 'challenges_balance_tracking', 'miner_receipts', 'miner_discoveries']
+
+SEED_QUERIES = [
+    """
+    INSERT INTO challenges_funds_flow (challenge, tx_id, network, created_at)
+    SELECT '{}', :network || '-' || g, :network, now() - g * interval '1 minute'
+    FROM generate_series(1, :challenges) AS g
+    """,
+    """
+    INSERT INTO challenges_balance_tracking (challenge, block_height, balance_tracking_expected_response, network, created_at)
+    SELECT '{}', :offset + g, g, :network, now() - g * interval '1 minute'
+    FROM generate_series(1, :challenges) AS g
+    """,
+    """
+    INSERT INTO miner_discoveries (uid, miner_key, miner_address, miner_ip_port, network, timestamp, rank,
+                                   failed_challenges, total_challenges, is_trusted, version, graph_db)
+    SELECT :offset + g, :network || '-miner-' || g, '0.0.0.0', '0', :network, now() - g * interval '1 second', random(),
+           0, 0, 0, 1.0, 'neo4j'
+    FROM generate_series(1, :miners) AS g
+    """,
+    """
+    INSERT INTO miner_receipts (request_id, miner_key, model_kind, network, query_hash, response_hash, accepted, timestamp)
+    SELECT 'req-' || :network || '-' || g, :network || '-miner-' || (g % :miners + 1), 'funds_flow', :network,
+           md5(g::text), md5(g::text), g % 3 = 0, now() - (g % 365) * interval '1 day'
+    FROM generate_series(1, :receipts) AS g
+    """,
+]
+
+HOT_QUERIES = {
+    "challenge rotation (funds flow)": """
+        SELECT id FROM challenges_funds_flow
+        WHERE network = :network
+        ORDER BY created_at DESC, id DESC
+        OFFSET :threshold
+    """,
+    "challenge rotation (balance tracking)": """
+        SELECT id FROM challenges_balance_tracking
+        WHERE network = :network
+        ORDER BY created_at DESC, id DESC
+        OFFSET :threshold
+    """,
+    "challenge pool load": """
+        SELECT challenge, tx_id FROM challenges_funds_flow
+        WHERE network = :network
+    """,
+    "receipts count by networks": """
+        SELECT network, COUNT(*) AS count
+        FROM miner_receipts
+        WHERE timestamp >= DATE_TRUNC('month', CURRENT_DATE) - INTERVAL '1 month'
+        GROUP BY network
+    """,
+    "receipt miner multiplier": """
+        WITH total_receipts AS (
+            SELECT network, COUNT(*) AS total_count
+            FROM miner_receipts
+            WHERE timestamp >= DATE_TRUNC('month', CURRENT_DATE) - INTERVAL '1 month'
+            GROUP BY network
+        ),
+        miner_accepted_counts AS (
+            SELECT miner_key, network, COUNT(CASE WHEN accepted = True THEN 1 END) AS accepted_true_count
+            FROM miner_receipts
+            WHERE timestamp >= DATE_TRUNC('month', CURRENT_DATE) - INTERVAL '1 month'
+              AND miner_receipts.network = :network
+            GROUP BY miner_key, network
+        )
+        SELECT mac.miner_key, mac.network, POWER(mac.accepted_true_count::float / tr.total_count, 2) AS multiplier
+        FROM miner_accepted_counts mac
+        JOIN total_receipts tr ON mac.network = tr.network
+    """,
+    "receipts by miner key": """
+        SELECT * FROM miner_receipts
+        WHERE miner_key = :network || '-miner-1'
+        ORDER BY timestamp DESC
+        LIMIT 10
+    """,
+    "miners by network": """
+        SELECT * FROM miner_discoveries
+        WHERE network = :network
+        ORDER BY timestamp, rank
+    """,
+}
+
+
+async def seed(connection, challenges: int, miners: int, receipts: int):
+    for table in TABLES:
+        await connection.execute(text(f"DROP TABLE IF EXISTS pg_temp.{table}"))
+        await connection.execute(text(f"CREATE TEMPORARY TABLE {table} (LIKE public.{table} INCLUDING ALL)"))
+        await connection.execute(text(f"CREATE TEMPORARY SEQUENCE {table}_bench_id_seq"))
+        await connection.execute(text(f"ALTER TABLE pg_temp.{table} ALTER COLUMN id SET DEFAULT nextval('{table}_bench_id_seq')"))
+
+    for index, network in enumerate(get_networks()):
+        params = {"network": network, "offset": index * max(challenges, miners), "challenges": challenges,
+                  "miners": miners, "receipts": receipts}
+        for seed_query in SEED_QUERIES:
+            await connection.execute(text(seed_query), params)
+
+    for table in TABLES:
+        await connection.execute(text(f"ANALYZE pg_temp.{table}"))
+
+
+async def drop_secondary_indexes(connection):
+    for table in TABLES:
+        result = await connection.execute(text("""
+            SELECT indexrelid::regclass::text
+            FROM pg_index
+            WHERE indrelid = CAST(:table AS regclass) AND NOT indisunique AND NOT indisprimary
+        """), {"table": table})
+        for (index_name,) in result.fetchall():
+            await connection.execute(text(f"DROP INDEX {index_name}"))
+
+
+def summarize_plan(node: dict) -> list[str]:
+    description = node["Node Type"]
+    if "Index Name" in node:
+        description += f" using {node['Index Name']}"
+    elif "Relation Name" in node:
+        description += f" on {node['Relation Name']}"
+    steps = [description]
+    for child in node.get("Plans", []):
+        steps.extend(summarize_plan(child))
+    return steps
+
+
+async def explain(connection, query: str, params: dict) -> tuple[float, list[str]]:
+    result = await connection.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {query}"), params)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Execution Time"], summarize_plan(plan[0]["Plan"])
+
+
+async def collect_plans(connection, params: dict) -> dict:
+    plans = {}
+    for name, query in HOT_QUERIES.items():
+        plans[name] = await explain(connection, query, params)
+    return plans
+
+
+async def run(database_url: str, challenges: int, miners: int, receipts: int, threshold: int):
+    session_manager = DatabaseSessionManager()
+    session_manager.init(database_url)
+    params = {"network": get_networks()[-1], "threshold": threshold}
+
+    try:
+        async with session_manager.connect() as connection:
+            await seed(connection, challenges, miners, receipts)
+
+            savepoint = await connection.begin_nested()
+            await drop_secondary_indexes(connection)
+            before = await collect_plans(connection, params)
+            await savepoint.rollback()
+
+            after = await collect_plans(connection, params)
+            await connection.rollback()
+    finally:
+        await session_manager.close()
+
+    for name in HOT_QUERIES.keys():
+        before_ms, before_plan = before[name]
+        after_ms, after_plan = after[name]
+        print(f"== {name}")
+        print(f"   before: {before_ms:10.3f} ms  {' -> '.join(before_plan)}")
+        print(f"   after:  {after_ms:10.3f} ms  {' -> '.join(after_plan)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare hot query plans with and without secondary indexes")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--challenges", type=int, default=1000, help="Challenges per network and model kind")
+    parser.add_argument("--miners", type=int, default=256, help="Miner discoveries per network")
+    parser.add_argument("--receipts", type=int, default=1_000_000, help="Miner receipts per network")
+    parser.add_argument("--threshold", type=int, default=1000, help="CHALLENGE_THRESHOLD used by the rotation query")
+    args = parser.parse_args()
+
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+
+    asyncio.run(run(args.database_url, args.challenges, args.miners, args.receipts, args.threshold))
@@ -0,0 +1,46 @@
+import asyncio
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from loguru import logger
+
+# blocks below the tip before a result is treated as final, as the challenge generators do
+FINALITY_CONFIRMATIONS = 6
+
+
+class ChainTipCache:
+    """
+    Latest block height per network, fetched with the network's blocking `fetchers` at most every
+    `ttl` seconds. A height that cannot be fetched is unknown, and nothing is final on that network
+    until it is known again.
+    """
+
+    def __init__(self, fetchers: Dict[str, Callable[[], Optional[int]]], ttl: int = 30,
+                 confirmations: int = FINALITY_CONFIRMATIONS):
+        self.fetchers = fetchers
+        self.ttl = ttl
+        self.confirmations = confirmations
+        self._heights: Dict[str, Tuple[float, Optional[int]]] = {}
+
+    async def height(self, network: str) -> Optional[int]:
+        cached = self._heights.get(network)
+        if cached is not None and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+
+        fetcher = self.fetchers.get(network)
+        if fetcher is None:
+            return None
+        try:
+            height = await asyncio.to_thread(fetcher)
+        except Exception as e:
+            logger.warning(f"Failed to fetch chain tip", network=network, error=e)
+            height = None
+        self._heights[network] = (time.monotonic(), height)
+        return height
+
+    async def is_final(self, network: str, block_heights: Optional[Iterable[int]]) -> bool:
+        heights = list(block_heights or [])
+        if not heights:
+            return False
+        tip = await self.height(network)
+        return tip is not None and max(heights) <= tip - self.confirmations
@@ -0,0 +1,44 @@
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+from loguru import logger
+
+from src.subnet.validator.challenges.challenge_pool import ChallengePool
+
+# model_kind -> (challenge json, expected response)
+ChallengeAssignment = Dict[str, Tuple[str, str]]
+
+
+class ChallengeAssignmentPlan:
+    """
+    Challenges for every miner of a round, drawn up front once each miner's network is known from
+    discovery. Miners whose network has no challenges for some model kind get no assignment.
+    """
+
+    def __init__(self, assignments: Dict[int, ChallengeAssignment]):
+        self.assignments = assignments
+
+    @classmethod
+    def build(cls, challenge_pool: ChallengePool, miner_networks: Dict[int, str], with_replacement: bool = True) -> 'ChallengeAssignmentPlan':
+        uids_by_network = defaultdict(list)
+        for uid, network in miner_networks.items():
+            uids_by_network[network].append(uid)
+
+        assignments: Dict[int, ChallengeAssignment] = {uid: {} for uid in miner_networks.keys()}
+        for network, uids in uids_by_network.items():
+            for model_kind in challenge_pool.managers.keys():
+                drawn = challenge_pool.draw(network, model_kind, len(uids), with_replacement)
+                if not drawn:
+                    logger.warning(f"No challenges available", network=network, model_kind=model_kind)
+                    continue
+                for uid, challenge in zip(uids, drawn):
+                    assignments[uid][model_kind] = challenge
+
+        model_kinds = set(challenge_pool.managers.keys())
+        return cls({uid: assignment for uid, assignment in assignments.items() if set(assignment.keys()) == model_kinds})
+
+    def get(self, uid: int) -> Optional[ChallengeAssignment]:
+        return self.assignments.get(uid)
+
+    def __len__(self):
+        return len(self.assignments)
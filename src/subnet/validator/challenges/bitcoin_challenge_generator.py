@@ -25,11 +25,7 @@ class BitcoinChallengeGenerator(ChallengeGenerator):
         challenge_json = json.dumps(funds_flow_challenge.model_dump())
         logger.debug(f"Generated Funds Flow Challenge", network=self.network, challenge=funds_flow_challenge.model_dump())
 
-        current_challenge_count = await challenge_manager.get_challenge_count(self.network)
-        if current_challenge_count >= threshold:
-            await challenge_manager.try_delete_oldest_challenge(self.network)
-
-        await challenge_manager.store_challenge(challenge_json, tx_id, self.network)
+        await challenge_manager.store_and_rotate([(challenge_json, tx_id)], self.network, threshold)
         logger.info(f"Challenge stored in the database successfully.", network=self.network)
 
     async def balance_tracking_generate_and_store(self, challenge_manager: ChallengeBalanceTrackingManager, threshold: int):
@@ -43,9 +39,5 @@ class BitcoinChallengeGenerator(ChallengeGenerator):
         challenge_json = balance_tracking_challenge.json()
         logger.debug(f"Generated Balance Tracking Challenge", network=self.network, challenge=balance_tracking_challenge.model_dump())
 
-        current_challenge_count = await challenge_manager.get_challenge_count(self.network)
-        if current_challenge_count >= threshold:
-            await challenge_manager.try_delete_oldest_challenge(self.network)
-
-        await challenge_manager.store_challenge(challenge_json, random_balance_tracking_block, balance_tracking_expected_response, self.network)
+        await challenge_manager.store_and_rotate([(challenge_json, random_balance_tracking_block, balance_tracking_expected_response)], self.network, threshold)
         logger.info(f"Challenge stored in the database successfully.", network=self.network)
@@ -0,0 +1,78 @@
+import random
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from src.subnet.protocol import get_networks, MODEL_KIND_FUNDS_FLOW, MODEL_KIND_BALANCE_TRACKING
+from src.subnet.validator.database.models.challenge_balance_tracking import ChallengeBalanceTrackingManager
+from src.subnet.validator.database.models.challenge_funds_flow import ChallengeFundsFlowManager
+
+
+class ChallengePool:
+    """
+    In-memory snapshot of the challenge tables, loaded with one query per network and model kind.
+    Miners sample from the snapshot, so the database sees O(networks) reads per refresh instead of
+    two random-row queries per miner.
+    """
+
+    def __init__(self,
+                 challenge_funds_flow_manager: ChallengeFundsFlowManager,
+                 challenge_balance_tracking_manager: ChallengeBalanceTrackingManager):
+        self.managers = {
+            MODEL_KIND_FUNDS_FLOW: challenge_funds_flow_manager,
+            MODEL_KIND_BALANCE_TRACKING: challenge_balance_tracking_manager,
+        }
+        self._snapshot: Dict[str, Dict[str, List[Tuple[str, str]]]] = {}
+        self._loaded_at: Optional[float] = None
+
+    def is_stale(self, refresh_interval: int) -> bool:
+        if self._loaded_at is None:
+            return True
+        return time.monotonic() - self._loaded_at >= refresh_interval
+
+    async def refresh(self, refresh_interval: int = 0, networks: Optional[Iterable[str]] = None) -> None:
+        """
+        Reloads the snapshot when it is older than `refresh_interval` seconds (0 reloads every call).
+        Networks missing from a fresh snapshot are loaded without touching the others.
+        """
+        networks = list(networks) if networks is not None else get_networks()
+        stale = self.is_stale(refresh_interval)
+        to_load = networks if stale else [network for network in networks if network not in self._snapshot]
+        if not to_load:
+            return
+
+        snapshot = {} if stale else dict(self._snapshot)
+        try:
+            for network in to_load:
+                snapshot[network] = {
+                    model_kind: await manager.get_challenges(network)
+                    for model_kind, manager in self.managers.items()
+                }
+        except Exception as e:
+            logger.error(f"Failed to refresh challenge pool, keeping previous snapshot", error=e)
+            return
+
+        self._snapshot = snapshot
+        if stale:
+            self._loaded_at = time.monotonic()
+        logger.debug(f"Refreshed challenge pool", sizes={
+            network: {model_kind: len(challenges) for model_kind, challenges in kinds.items()}
+            for network, kinds in snapshot.items()
+        })
+
+    def draw(self, network: str, model_kind: str, count: int, with_replacement: bool = True) -> List[Tuple[str, str]]:
+        """
+        Draws `count` challenges at once. Without replacement every challenge is used before any is
+        repeated, so repeats only happen when `count` exceeds the pool size.
+        """
+        challenges = self._snapshot.get(network, {}).get(model_kind)
+        if not challenges or count <= 0:
+            return []
+        if with_replacement:
+            return random.choices(challenges, k=count)
+
+        drawn = []
+        while len(drawn) < count:
+            drawn.extend(random.sample(challenges, min(len(challenges), count - len(drawn))))
+        return drawn
@@ -30,13 +30,9 @@ class CommuneChallengeGenerator(ChallengeGenerator):
             return
 
         challenge_json = json.dumps(funds_flow_challenge.model_dump())
-        current_challenge_count = await challenge_manager.get_challenge_count(self.network)
         logger.debug(f"Generated Funds Flow Challenge", network=self.network, challenge=funds_flow_challenge.model_dump())
 
-        if current_challenge_count >= threshold:
-            await challenge_manager.try_delete_oldest_challenge(self.network)
-
-        await challenge_manager.store_challenge(challenge_json, tx_id, self.network)
+        await challenge_manager.store_and_rotate([(challenge_json, tx_id)], self.network, threshold)
         logger.info(f"Funds Flow Challenge stored in the database successfully.", network=self.network)
 
     async def balance_tracking_generate_and_store(self, challenge_manager: ChallengeBalanceTrackingManager, threshold: int):
@@ -55,11 +51,7 @@ class CommuneChallengeGenerator(ChallengeGenerator):
         challenge_json = json.dumps(balance_tracking_challenge.model_dump())
         logger.debug(f"Generated Balance Tracking Challenge", network=self.network, challenge=balance_tracking_challenge.model_dump())
 
-        current_challenge_count = await challenge_manager.get_challenge_count(self.network)
-        if current_challenge_count >= threshold:
-            await challenge_manager.try_delete_oldest_challenge(self.network)
-
-        await challenge_manager.store_challenge(challenge_json, last_block_height,  balance_tracking_expected_response, self.network)
+        await challenge_manager.store_and_rotate([(challenge_json, last_block_height, balance_tracking_expected_response)], self.network, threshold)
         logger.info(f"Challenge stored in the database successfully.", network=self.network)
 
 
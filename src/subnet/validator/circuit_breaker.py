@@ -0,0 +1,60 @@
+import time
+from dataclasses import dataclass
+from typing import Dict
+
+from loguru import logger
+
+CIRCUIT_CLOSED = 'closed'
+CIRCUIT_OPEN = 'open'
+CIRCUIT_HALF_OPEN = 'half_open'
+
+
+@dataclass
+class _Circuit:
+    state: str = CIRCUIT_CLOSED
+    failures: int = 0
+    changed_at: float = 0.0
+
+
+class MinerCircuitBreaker:
+    """
+    Per-miner circuit breaker over transport failures (unreachable, timed out or erroring calls).
+    After `failure_threshold` consecutive failures a miner's circuit opens and it is skipped, scoring
+    zero, until `open_interval` seconds pass. Then one round probes it (half-open): success closes the
+    circuit, failure opens it again.
+    """
+
+    def __init__(self):
+        self._circuits: Dict[str, _Circuit] = {}
+
+    def state(self, miner_key: str) -> str:
+        circuit = self._circuits.get(miner_key)
+        return circuit.state if circuit else CIRCUIT_CLOSED
+
+    def allow(self, miner_key: str, open_interval: int) -> bool:
+        circuit = self._circuits.get(miner_key)
+        if circuit is None or circuit.state == CIRCUIT_CLOSED:
+            return True
+
+        # a half-open probe that never reported back is retried after another interval
+        if time.monotonic() - circuit.changed_at < open_interval:
+            return False
+
+        circuit.state, circuit.changed_at = CIRCUIT_HALF_OPEN, time.monotonic()
+        logger.debug(f"Probing miner with open circuit", miner_key=miner_key)
+        return True
+
+    def record_success(self, miner_key: str):
+        circuit = self._circuits.pop(miner_key, None)
+        if circuit is not None and circuit.state != CIRCUIT_CLOSED:
+            logger.info(f"Closed miner circuit", miner_key=miner_key)
+
+    def record_failure(self, miner_key: str, failure_threshold: int):
+        circuit = self._circuits.setdefault(miner_key, _Circuit())
+        circuit.failures += 1
+        if circuit.state == CIRCUIT_HALF_OPEN or (circuit.state == CIRCUIT_CLOSED and circuit.failures >= failure_threshold):
+            circuit.state, circuit.changed_at = CIRCUIT_OPEN, time.monotonic()
+            logger.info(f"Opened miner circuit", miner_key=miner_key, failures=circuit.failures)
+
+    def open_count(self) -> int:
+        return sum(1 for circuit in self._circuits.values() if circuit.state != CIRCUIT_CLOSED)
@@ -14,6 +14,7 @@ from .session_manager import db_manager, get_session
 from .models.api_key import ApiKey
 from .models.challenge_funds_flow import ChallengeFundsFlow
 from .models.challenge_balance_tracking import ChallengeBalanceTracking
+from .models.miner_latency import MinerLatency
 
 __all__ = ["OrmBase", "get_session", "db_manager", "MinerDiscovery", "MinerReceipt", "ApiKey",
-           "ChallengeFundsFlow", "ChallengeBalanceTracking"]
\ No newline at end of file
+           "ChallengeFundsFlow", "ChallengeBalanceTracking", "MinerLatency"]
\ No newline at end of file
@@ -1,5 +1,5 @@
-from typing import Optional, Tuple
-from sqlalchemy import Column, Integer, String, DateTime, insert, delete
+from typing import List, Optional, Tuple
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Index, insert, delete
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.future import select
 from sqlalchemy.dialects.postgresql import insert
@@ -17,11 +17,15 @@ class ChallengeBalanceTracking(OrmBase):
     __tablename__ = 'challenges_balance_tracking'
     id = Column(Integer, primary_key=True, autoincrement=True)
     challenge = Column(String, nullable=False)
-    block_height = Column(String, nullable=False, unique=True)
+    block_height = Column(BigInteger, nullable=False, unique=True)
     balance_tracking_expected_response = Column(String, nullable=False)  # Added expected response field
     network = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        Index('ix__challenges_balance_tracking__network_created_at_id', 'network', 'created_at', 'id'),
+    )
+
 
 class ChallengeBalanceTrackingManager:
     def __init__(self, session_manager: DatabaseSessionManager):
@@ -32,7 +36,7 @@ class ChallengeBalanceTrackingManager:
             async with session.begin():
                 stmt = insert(ChallengeBalanceTracking).values(
                     challenge=challenge,
-                    block_height=str(block_height),
+                    block_height=int(block_height),
                     balance_tracking_expected_response=str(expected_response),
                     network=network,
                     created_at=datetime.utcnow()  # Automatically set the created_at field
@@ -47,47 +51,66 @@ class ChallengeBalanceTrackingManager:
                 )
                 await session.execute(stmt)
 
-    async def get_random_challenge(self, network: str) -> Tuple[str, str]:
+    async def get_challenges(self, network: str) -> List[Tuple[str, str]]:
         async with self.session_manager.session() as session:
-            query = text("""
-                SELECT challenge, balance_tracking_expected_response 
-                FROM challenges_balance_tracking 
-                WHERE network = :network 
-                ORDER BY RANDOM() 
-                LIMIT 1
-            """)
-            result = await session.execute(query, {"network": network})
-            row = result.fetchone()
+            result = await session.execute(
+                select(ChallengeBalanceTracking.challenge, ChallengeBalanceTracking.balance_tracking_expected_response)
+                .where(ChallengeBalanceTracking.network == network)
+            )
+            return [(row[0], row[1]) for row in result.fetchall()]
 
-            if row:
-                # Access tuple values by index
-                return row[0], row[1]
-            return None, None
+    async def store_and_rotate(self, challenges: List[Tuple[str, int, str]], network: str, threshold: int):
+        """
+        Upserts a batch of (challenge, block_height, expected_response) tuples and trims the network's pool
+        to the newest `threshold` rows, all in one transaction. The advisory lock serializes concurrent
+        generators per network.
+        """
+        if not challenges:
+            return
 
-    async def get_challenge_count(self, network: str):
-        async with self.session_manager.session() as session:
-            result = await session.execute(
-                select(func.count(ChallengeBalanceTracking.id)).where(ChallengeBalanceTracking.network == network)
+        created_at = datetime.utcnow()
+        rows = {
+            int(block_height): dict(
+                challenge=challenge,
+                block_height=int(block_height),
+                balance_tracking_expected_response=str(expected_response),
+                network=network,
+                created_at=created_at
             )
-            return result.scalar()
+            for challenge, block_height, expected_response in challenges
+        }
 
-    async def try_delete_oldest_challenge(self, network: str):
         async with self.session_manager.session() as session:
             async with session.begin():
-                # Raw SQL query to delete the oldest challenge and return the deleted ID
-                query = text("""
-                       DELETE FROM challenges_balance_tracking
-                       WHERE id = (
-                           SELECT id FROM challenges_balance_tracking
-                           WHERE network = :network
-                           ORDER BY created_at ASC
-                           LIMIT 1
-                       )
-                       RETURNING id
-                   """)
-                result = await session.execute(query, {"network": network})
-                deleted_id = result.fetchone()
+                await session.execute(
+                    text("SELECT pg_advisory_xact_lock(hashtext(:lock_key))"),
+                    {"lock_key": f"{ChallengeBalanceTracking.__tablename__}:{network}"}
+                )
 
-                if deleted_id:
-                    logger.info(f"Deleted oldest challenge with ID: {deleted_id[0]}")
+                stmt = insert(ChallengeBalanceTracking).values(list(rows.values()))
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=['block_height'],
+                    set_=dict(
+                        challenge=stmt.excluded.challenge,
+                        balance_tracking_expected_response=stmt.excluded.balance_tracking_expected_response,
+                        network=stmt.excluded.network,
+                        created_at=stmt.excluded.created_at
+                    )
+                )
+                await session.execute(stmt)
+
+                query = text("""
+                    DELETE FROM challenges_balance_tracking
+                    WHERE id IN (
+                        SELECT id FROM challenges_balance_tracking
+                        WHERE network = :network
+                        ORDER BY created_at DESC, id DESC
+                        OFFSET :threshold
+                    )
+                    RETURNING id
+                """)
+                result = await session.execute(query, {"network": network, "threshold": threshold})
+                deleted_ids = [row[0] for row in result.fetchall()]
 
+                if deleted_ids:
+                    logger.info(f"Rotated out oldest challenges", network=network, deleted_ids=deleted_ids)
@@ -1,5 +1,5 @@
-from typing import Tuple
-from sqlalchemy import Column, Integer, String, DateTime, insert
+from typing import List, Tuple
+from sqlalchemy import Column, Integer, String, DateTime, Index, insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.future import select
 from sqlalchemy.dialects.postgresql import insert
@@ -21,6 +21,10 @@ class ChallengeFundsFlow(OrmBase):
     network = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        Index('ix__challenges_funds_flow__network_created_at_id', 'network', 'created_at', 'id'),
+    )
+
 class ChallengeFundsFlowManager:
     def __init__(self, session_manager: DatabaseSessionManager):
         self.session_manager = session_manager
@@ -43,46 +47,56 @@ class ChallengeFundsFlowManager:
                 )
                 await session.execute(stmt)
 
-    async def get_random_challenge(self, network: str) -> Tuple[str, str]:
-        async with self.session_manager.session() as session:
-            query = text("""
-                SELECT challenge, tx_id 
-                FROM challenges_funds_flow 
-                WHERE network = :network 
-                ORDER BY RANDOM() 
-                LIMIT 1
-            """)
-            result = await session.execute(query, {"network": network})
-            row = result.fetchone()
-
-            if row:
-                # Access tuple values by index
-                return row[0], row[1]
-            return None, None
-
-    async def get_challenge_count(self, network: str):
+    async def get_challenges(self, network: str) -> List[Tuple[str, str]]:
         async with self.session_manager.session() as session:
             result = await session.execute(
-                select(func.count(ChallengeFundsFlow.id)).where(ChallengeFundsFlow.network == network)
+                select(ChallengeFundsFlow.challenge, ChallengeFundsFlow.tx_id)
+                .where(ChallengeFundsFlow.network == network)
             )
-            return result.scalar()
+            return [(row[0], row[1]) for row in result.fetchall()]
+
+    async def store_and_rotate(self, challenges: List[Tuple[str, str]], network: str, threshold: int):
+        """
+        Upserts a batch of (challenge, tx_id) pairs and trims the network's pool to the newest `threshold`
+        rows, all in one transaction. The advisory lock serializes concurrent generators per network.
+        """
+        if not challenges:
+            return
+
+        created_at = datetime.utcnow()
+        rows = {tx_id: dict(challenge=challenge, tx_id=tx_id, network=network, created_at=created_at)
+                for challenge, tx_id in challenges}
 
-    async def try_delete_oldest_challenge(self, network: str):
         async with self.session_manager.session() as session:
             async with session.begin():
-                # Raw SQL query to delete the oldest challenge and return the deleted ID
+                await session.execute(
+                    text("SELECT pg_advisory_xact_lock(hashtext(:lock_key))"),
+                    {"lock_key": f"{ChallengeFundsFlow.__tablename__}:{network}"}
+                )
+
+                stmt = insert(ChallengeFundsFlow).values(list(rows.values()))
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=['tx_id'],
+                    set_=dict(
+                        challenge=stmt.excluded.challenge,
+                        network=stmt.excluded.network,
+                        created_at=stmt.excluded.created_at
+                    )
+                )
+                await session.execute(stmt)
+
                 query = text("""
                     DELETE FROM challenges_funds_flow
-                    WHERE id = (
+                    WHERE id IN (
                         SELECT id FROM challenges_funds_flow
                         WHERE network = :network
-                        ORDER BY created_at ASC
-                        LIMIT 1
+                        ORDER BY created_at DESC, id DESC
+                        OFFSET :threshold
                     )
                     RETURNING id
                 """)
-                result = await session.execute(query, {"network": network})
-                deleted_id = result.fetchone()
+                result = await session.execute(query, {"network": network, "threshold": threshold})
+                deleted_ids = [row[0] for row in result.fetchall()]
 
-                if deleted_id:
-                    logger.info(f"Deleted oldest challenge with ID: {deleted_id[0]}")
+                if deleted_ids:
+                    logger.info(f"Rotated out oldest challenges", network=network, deleted_ids=deleted_ids)
@@ -1,7 +1,7 @@
 import random
-from typing import Optional
+from typing import Dict, List, Optional, Set, Tuple
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, update, insert, func, text
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index, update, insert, func, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.future import select
 from sqlalchemy.dialects.postgresql import insert
@@ -31,6 +31,10 @@ class MinerDiscovery(OrmBase):
     version = Column(Float, nullable=False, default=1.0)
     graph_db = Column(String, nullable=False, default='neo4j')
 
+    __table_args__ = (
+        Index('ix__miner_discoveries__network', 'network'),
+    )
+
 
 class MinerDiscoveryManager:
     def __init__(self, session_manager: DatabaseSessionManager):
@@ -62,6 +66,32 @@ class MinerDiscoveryManager:
                 )
                 await session.execute(stmt)
 
+    async def store_miners_metadata(self, miners: List[Dict]):
+        """
+        Multi-row upsert of the metadata `store_miner_metadata` stores for one miner. Each dict carries
+        uid, miner_key, miner_address, miner_ip_port, network, version and graph_db.
+        """
+        rows = {miner['miner_key']: {**miner, 'timestamp': datetime.utcnow()} for miner in miners}
+        if not rows:
+            return
+
+        async with self.session_manager.session() as session:
+            async with session.begin():
+                stmt = insert(MinerDiscovery).values(list(rows.values()))
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=['miner_key'],
+                    set_={
+                        'uid': stmt.excluded.uid,
+                        'miner_address': stmt.excluded.miner_address,
+                        'miner_ip_port': stmt.excluded.miner_ip_port,
+                        'network': stmt.excluded.network,
+                        'version': stmt.excluded.version,
+                        'graph_db': stmt.excluded.graph_db,
+                        'timestamp': stmt.excluded.timestamp
+                    }
+                )
+                await session.execute(stmt)
+
     async def get_miner_by_key(self, miner_key: str, network: str):
         async with self.session_manager.session() as session:
             result = await session.execute(
@@ -113,6 +143,20 @@ class MinerDiscoveryManager:
                 ).values(rank=new_rank)
                 await session.execute(stmt)
 
+    async def update_miners_ranks(self, ranks: Dict[str, float]):
+        if not ranks:
+            return
+
+        values, params = self._values_clause(list(ranks.items()), ['VARCHAR', 'FLOAT'])
+        async with self.session_manager.session() as session:
+            async with session.begin():
+                await session.execute(text(f"""
+                    UPDATE miner_discoveries AS md
+                    SET rank = v.rank
+                    FROM (VALUES {values}) AS v(miner_key, rank)
+                    WHERE md.miner_key = v.miner_key
+                """), params)
+
     async def update_miner_challenges(self, miner_key: str, failed_challenges_inc: int, total_challenges_inc: int = 2):
         async with self.session_manager.session() as session:
             async with session.begin():
@@ -124,6 +168,49 @@ class MinerDiscoveryManager:
                 )
                 await session.execute(stmt)
 
+    async def update_miners_challenges(self, challenges: List[Tuple[str, int, int]]) -> Set[str]:
+        """
+        Batched `update_miner_challenges` for (miner_key, failed_challenges_inc, total_challenges_inc) rows,
+        which also refreshes their timestamp. Returns the keys of the miners that were found.
+        """
+        increments: Dict[str, Tuple[int, int]] = {}
+        for miner_key, failed_challenges_inc, total_challenges_inc in challenges:
+            failed, total = increments.get(miner_key, (0, 0))
+            increments[miner_key] = (failed + failed_challenges_inc, total + total_challenges_inc)
+        if not increments:
+            return set()
+
+        values, params = self._values_clause(
+            [(miner_key, failed, total) for miner_key, (failed, total) in increments.items()],
+            ['VARCHAR', 'INTEGER', 'INTEGER']
+        )
+        async with self.session_manager.session() as session:
+            async with session.begin():
+                result = await session.execute(text(f"""
+                    UPDATE miner_discoveries AS md
+                    SET failed_challenges = md.failed_challenges + v.failed_challenges_inc,
+                        total_challenges = md.total_challenges + v.total_challenges_inc,
+                        timestamp = :timestamp
+                    FROM (VALUES {values}) AS v(miner_key, failed_challenges_inc, total_challenges_inc)
+                    WHERE md.miner_key = v.miner_key
+                    RETURNING md.miner_key
+                """), {**params, 'timestamp': datetime.utcnow()})
+                return {row[0] for row in result.fetchall()}
+
+    @staticmethod
+    def _values_clause(rows: List[Tuple], types: List[str]) -> Tuple[str, Dict]:
+        """
+        Renders rows as a VALUES list of bound parameters, cast to `types` column by column.
+        """
+        tuples, params = [], {}
+        for i, row in enumerate(rows):
+            placeholders = []
+            for j, (value, type_) in enumerate(zip(row, types)):
+                params[f"v{i}_{j}"] = value
+                placeholders.append(f"CAST(:v{i}_{j} AS {type_})")
+            tuples.append(f"({', '.join(placeholders)})")
+        return ', '.join(tuples), params
+
     async def remove_all_records(self):
         async with self.session_manager.session() as session:
             async with session.begin():
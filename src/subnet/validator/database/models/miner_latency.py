@@ -0,0 +1,75 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Column, BigInteger, Integer, String, Float, DateTime, Index, select
+from sqlalchemy.dialects.postgresql import JSONB, insert
+
+from src.subnet.validator.database import OrmBase
+from src.subnet.validator.database.base_model import to_dict
+from src.subnet.validator.database.session_manager import DatabaseSessionManager
+
+
+class MinerLatency(OrmBase):
+    __tablename__ = 'miner_latencies'
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    miner_key = Column(String, nullable=False)
+    endpoint = Column(String, nullable=False)
+    window_start = Column(DateTime, nullable=False)
+    window_end = Column(DateTime, nullable=False)
+    count = Column(Integer, nullable=False)
+    error_count = Column(Integer, nullable=False, default=0)
+    mean_ms = Column(Float, nullable=True)
+    p50_ms = Column(Float, nullable=True)
+    p90_ms = Column(Float, nullable=True)
+    p99_ms = Column(Float, nullable=True)
+    buckets = Column(JSONB, nullable=False)
+
+    __table_args__ = (
+        Index('ix__miner_latencies__miner_key_endpoint_window_end', 'miner_key', 'endpoint', 'window_end'),
+        Index('ix__miner_latencies__window_end', 'window_end'),
+    )
+
+
+class MinerLatencyManager:
+    def __init__(self, session_manager: DatabaseSessionManager):
+        self.session_manager = session_manager
+
+    async def store_latency_rollup(self, window_start: datetime, window_end: datetime, histograms: Dict[Tuple[str, str], Dict]):
+        """
+        Stores one row per (miner_key, endpoint) for the window, from `LatencyHistogram.to_dict()` values.
+        """
+        if not histograms:
+            return
+
+        rows = [
+            {
+                'miner_key': miner_key,
+                'endpoint': endpoint,
+                'window_start': window_start,
+                'window_end': window_end,
+                'count': histogram['count'],
+                'error_count': histogram['error_count'],
+                'mean_ms': histogram['mean_ms'],
+                'p50_ms': histogram['p50_ms'],
+                'p90_ms': histogram['p90_ms'],
+                'p99_ms': histogram['p99_ms'],
+                'buckets': histogram['buckets'],
+            }
+            for (miner_key, endpoint), histogram in histograms.items()
+        ]
+        async with self.session_manager.session() as session:
+            async with session.begin():
+                await session.execute(insert(MinerLatency).values(rows))
+
+    async def get_latency_rollups(self, miner_key: Optional[str] = None, endpoint: Optional[str] = None,
+                                  since: Optional[datetime] = None, limit: int = 100) -> List[Dict]:
+        async with self.session_manager.session() as session:
+            query = select(MinerLatency)
+            if miner_key:
+                query = query.where(MinerLatency.miner_key == miner_key)
+            if endpoint:
+                query = query.where(MinerLatency.endpoint == endpoint)
+            if since:
+                query = query.where(MinerLatency.window_end >= since)
+            result = await session.execute(query.order_by(MinerLatency.window_end.desc()).limit(limit))
+            return [to_dict(row) for row in result.scalars().all()]
@@ -1,7 +1,7 @@
 from typing import List, Optional, Dict, Union
 from pydantic import BaseModel
 from sqlalchemy import Column, String, DateTime, update, insert, BigInteger, Boolean, UniqueConstraint, Text, select, \
-    func, text
+    func, text, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.dialects.postgresql import insert
 from datetime import datetime
@@ -25,6 +25,8 @@ class MinerReceipt(OrmBase):
 
     __table_args__ = (
         UniqueConstraint('miner_key', 'request_id', name='uq_miner_key_request_id'),
+        Index('ix__miner_receipts__network_timestamp_miner_key', 'network', 'timestamp', 'miner_key', postgresql_include=['accepted']),
+        Index('ix__miner_receipts__miner_key_timestamp', 'miner_key', 'timestamp'),
     )
 
 
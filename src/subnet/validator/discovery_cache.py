@@ -0,0 +1,46 @@
+import time
+from typing import Dict, Optional, Tuple
+
+from loguru import logger
+
+from src.subnet.protocol import Discovery
+
+
+class DiscoveryCache:
+    """
+    Last discovery answer of every miner key, so rounds can skip the `discovery` RPC for miners whose
+    network, version and graph_db were seen recently at the same address.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Tuple[str, int], Discovery, float]] = {}
+        self._cleared_at = time.monotonic()
+
+    def start_round(self, full_refresh_interval: int) -> None:
+        """
+        Drops every entry once `full_refresh_interval` seconds have passed since the last full refresh,
+        so all miners are rediscovered at least that often (0 disables the cadence).
+        """
+        if full_refresh_interval > 0 and time.monotonic() - self._cleared_at >= full_refresh_interval:
+            logger.debug(f"Full discovery refresh", cached_miners=len(self._entries))
+            self._entries.clear()
+            self._cleared_at = time.monotonic()
+
+    def get(self, miner_key: str, address: Tuple[str, int], ttl: int) -> Optional[Discovery]:
+        entry = self._entries.get(miner_key)
+        if entry is None:
+            return None
+        cached_address, discovery, stored_at = entry
+        if cached_address != address or time.monotonic() - stored_at >= ttl:
+            del self._entries[miner_key]
+            return None
+        return discovery
+
+    def put(self, miner_key: str, address: Tuple[str, int], discovery: Discovery) -> None:
+        self._entries[miner_key] = (address, discovery, time.monotonic())
+
+    def invalidate(self, miner_key: str) -> None:
+        self._entries.pop(miner_key, None)
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,4 +1,8 @@
 import hashlib
+import json
+from typing import Any, Union
+
+import orjson
 
 
 def generate_hash(text: str) -> str:
@@ -7,3 +11,58 @@ def generate_hash(text: str) -> str:
     text_bytes = text.encode('utf-8')
     sha256_hash = hashlib.sha256(text_bytes).hexdigest()
     return sha256_hash
+
+
+# orjson serializes integers natively only within 64 bits
+_INT_RANGE = range(-2 ** 63, 2 ** 64)
+
+
+class ResponseFloat(float):
+    """
+    Float decoded from a miner response. It behaves and serializes like any float, so the payload handed
+    to clients is unchanged, but orjson leaves float subclasses to `default`, where the hash normalizes it.
+    """
+    __slots__ = ()
+
+
+def _normalize_number(number: Union[int, float]) -> Union[int, float, str]:
+    # integral floats hash as integers, other floats rounded to 15 significant digits, and integers
+    # beyond 64 bits as their decimal string
+    if isinstance(number, float):
+        if not number.is_integer():
+            return float(f"{number:.15g}")
+        number = int(number)
+    return number if number in _INT_RANGE else str(number)
+
+
+def _hash_default(value: Any) -> Any:
+    if isinstance(value, float):
+        return _normalize_number(value)
+    return str(value)
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return _normalize_number(value)
+    return value
+
+
+def canonical_loads(text: Union[str, bytes]) -> Any:
+    return json.loads(text, parse_float=ResponseFloat)
+
+
+def generate_response_hash(response: Any) -> str:
+    """
+    blake2b of the sorted-key orjson serialization of a response decoded with `canonical_loads`, with
+    numbers normalized in the hashed bytes only, so formatting differences between miners hash equal.
+    """
+    try:
+        canonical = orjson.dumps(response, option=orjson.OPT_SORT_KEYS, default=_hash_default)
+    except TypeError:
+        # integers beyond 64 bits, which orjson cannot serialize: normalize the whole response up front
+        canonical = orjson.dumps(_normalize(response), option=orjson.OPT_SORT_KEYS, default=_hash_default)
+    return hashlib.blake2b(canonical, digest_size=32).hexdigest()
@@ -0,0 +1,142 @@
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+LATENCY_ENDPOINT_DISCOVERY = 'discovery'
+LATENCY_ENDPOINT_QUERY = 'query'
+
+# upper bounds of the histogram buckets in milliseconds, the last bucket catches everything slower
+LATENCY_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000]
+
+
+def challenge_endpoint(model_kind: str) -> str:
+    return f'challenge_{model_kind}'
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram. Percentiles are estimated as the upper bound of the bucket that
+    holds them, which is what routing and capacity planning need without keeping raw samples.
+    Failed and censored calls are only counted, in `error_count` and `censored_count`: a failure's
+    elapsed time measures the error rather than the miner, and a censored call's is a lower bound
+    that would make the slowest miners look fast.
+    """
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.error_count = 0
+        self.censored_count = 0
+        self.sum_ms = 0.0
+
+    def observe(self, seconds: float, failed: bool = False):
+        if failed:
+            self.error_count += 1
+            return
+        elapsed_ms = seconds * 1000
+        index = next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if elapsed_ms <= bound), len(LATENCY_BUCKETS_MS))
+        self.buckets[index] += 1
+        self.count += 1
+        self.sum_ms += elapsed_ms
+
+    def observe_censored(self):
+        self.censored_count += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return float(LATENCY_BUCKETS_MS[index]) if index < len(LATENCY_BUCKETS_MS) else float('inf')
+        return float('inf')
+
+    def finite_percentile(self, q: float) -> Optional[float]:
+        # JSON and reporting friendly: percentiles past the last bucket are unknown rather than infinite
+        value = self.percentile(q)
+        return None if value == float('inf') else value
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'error_count': self.error_count,
+            'censored_count': self.censored_count,
+            'mean_ms': self.sum_ms / self.count if self.count else None,
+            'p50_ms': self.finite_percentile(0.5),
+            'p90_ms': self.finite_percentile(0.9),
+            'p99_ms': self.finite_percentile(0.99),
+            'buckets': {
+                (f'le_{bound}' if i < len(LATENCY_BUCKETS_MS) else 'inf'): bucket_count
+                for i, (bound, bucket_count) in enumerate(zip(LATENCY_BUCKETS_MS + [None], self.buckets))
+            },
+        }
+
+
+class LatencyRecorder:
+    """
+    Per (miner_key, endpoint) latency histograms. `totals` cover the life of the process and back
+    lookups like percentile(); the current window is handed over by `drain()` for rollup to the
+    database and then starts empty. Observations can also feed a `group` histogram shared by many
+    miners, such as (network, model_kind), which is kept for lookups only.
+    """
+
+    def __init__(self):
+        self._totals: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._window: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._groups: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._window_start = datetime.utcnow()
+        self._last_drain = time.monotonic()
+
+    def _histograms(self, miner_key: str, endpoint: str, group: Optional[Tuple[str, str]]) -> List[LatencyHistogram]:
+        histograms = [series.setdefault((miner_key, endpoint), LatencyHistogram()) for series in (self._totals, self._window)]
+        if group is not None:
+            histograms.append(self._groups.setdefault(group, LatencyHistogram()))
+        return histograms
+
+    def observe(self, miner_key: str, endpoint: str, seconds: float, failed: bool = False,
+                group: Optional[Tuple[str, str]] = None):
+        for histogram in self._histograms(miner_key, endpoint, group):
+            histogram.observe(seconds, failed)
+
+    def observe_censored(self, miner_key: str, endpoint: str, group: Optional[Tuple[str, str]] = None):
+        for histogram in self._histograms(miner_key, endpoint, group):
+            histogram.observe_censored()
+
+    @contextmanager
+    def measure(self, miner_key: str, endpoint: str):
+        started = time.perf_counter()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            self.observe(miner_key, endpoint, time.perf_counter() - started, failed)
+
+    def percentile(self, miner_key: str, endpoint: str, q: float) -> Optional[float]:
+        histogram = self._totals.get((miner_key, endpoint))
+        return histogram.percentile(q) if histogram else None
+
+    def group_percentile(self, group: Tuple[str, str], q: float) -> Optional[float]:
+        histogram = self._groups.get(group)
+        return histogram.percentile(q) if histogram else None
+
+    def summary(self, miner_key: Optional[str] = None, endpoint: Optional[str] = None) -> List[Dict]:
+        return [
+            {'miner_key': key, 'endpoint': name, **histogram.to_dict()}
+            for (key, name), histogram in sorted(self._totals.items())
+            if (miner_key is None or key == miner_key) and (endpoint is None or name == endpoint)
+        ]
+
+    def due(self, rollup_interval: int) -> bool:
+        return bool(self._window) and time.monotonic() - self._last_drain >= rollup_interval
+
+    def drain(self) -> Tuple[datetime, datetime, Dict[Tuple[str, str], LatencyHistogram]]:
+        window, window_start, window_end = self._window, self._window_start, datetime.utcnow()
+        self._window, self._window_start, self._last_drain = {}, window_end, time.monotonic()
+        logger.debug(f"Drained latency window", histograms=len(window))
+        return window_start, window_end, window
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Set, Tuple, cast
+
+from communex.client import CommuneClient  # type: ignore
+from communex.misc import get_map_modules
+from loguru import logger
+
+from .helpers import get_ip_port
+
+# uid -> ((ip, port), module metadata)
+MinerModuleInfo = Tuple[Tuple[str, str], Mapping[str, Any]]
+
+
+@dataclass(frozen=True)
+class MetagraphSnapshot:
+    """
+    Read-only view of the subnet's modules at `fetched_at`. Only modules with a parseable address
+    are listed in `miners`.
+    """
+    modules: Mapping[str, Mapping[str, Any]]
+    miners: Mapping[int, MinerModuleInfo]
+    fetched_at: float
+
+    def diff(self, previous: Optional['MetagraphSnapshot']) -> Set[int]:
+        """
+        Uids that are new since `previous` or whose key, address or emission changed.
+        """
+        if previous is None:
+            return set(self.miners.keys())
+
+        changed = set()
+        for uid, (address, metadata) in self.miners.items():
+            old = previous.miners.get(uid)
+            if old is None:
+                changed.add(uid)
+                continue
+            old_address, old_metadata = old
+            if old_address != address or old_metadata['key'] != metadata['key'] or old_metadata['emission'] != metadata['emission']:
+                changed.add(uid)
+        return changed
+
+
+class MetagraphService(threading.Thread):
+    """
+    Refreshes the metagraph from the chain every `refresh_interval` seconds in its own thread, so the
+    blocking substrate queries stay off the event loop. Callers only ever see whole snapshots.
+    """
+
+    def __init__(self, client: CommuneClient, netuid: int, refresh_interval: int, terminate_event: threading.Event):
+        super().__init__(daemon=True)
+        self.client = client
+        self.netuid = netuid
+        self.refresh_interval = refresh_interval
+        self.terminate_event = terminate_event
+        self._snapshot: Optional[MetagraphSnapshot] = None
+
+    @property
+    def snapshot(self) -> Optional[MetagraphSnapshot]:
+        return self._snapshot
+
+    def fetch(self) -> MetagraphSnapshot:
+        modules = cast(Dict[str, Dict], get_map_modules(self.client, netuid=self.netuid, include_balances=False))
+        modules_addresses = self.client.query_map_address(self.netuid)
+        for uid, addr in modules_addresses.items():
+            if addr.startswith('None'):
+                port = addr.split(':')[1]
+                modules_addresses[uid] = f'0.0.0.0:{port}'
+        ip_ports = get_ip_port(modules_addresses)
+
+        frozen_modules = {key: MappingProxyType(dict(metadata)) for key, metadata in modules.items()}
+        miners = {
+            metadata['uid']: (tuple(ip_ports[metadata['uid']]), metadata)
+            for metadata in frozen_modules.values()
+            if metadata['uid'] in ip_ports
+        }
+        return MetagraphSnapshot(MappingProxyType(frozen_modules), MappingProxyType(miners), time.monotonic())
+
+    def refresh(self) -> MetagraphSnapshot:
+        snapshot = self.fetch()
+        self._snapshot = snapshot
+        logger.debug(f"Refreshed metagraph", modules=len(snapshot.modules), miners=len(snapshot.miners))
+        return snapshot
+
+    async def get_snapshot(self) -> MetagraphSnapshot:
+        """
+        Latest snapshot, fetched in a worker thread when there is none yet or the background refresh
+        has fallen more than one interval behind (e.g. the service thread was never started).
+        """
+        snapshot = self._snapshot
+        if snapshot is None or time.monotonic() - snapshot.fetched_at >= 2 * self.refresh_interval:
+            snapshot = await asyncio.to_thread(self.refresh)
+        return snapshot
+
+    def run(self):
+        while not self.terminate_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Failed to refresh metagraph, keeping previous snapshot", error=e)
+            self.terminate_event.wait(self.refresh_interval)
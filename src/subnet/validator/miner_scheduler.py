@@ -0,0 +1,79 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from loguru import logger
+
+
+class MinerChallengeScheduler:
+    """
+    Runs one job per miner with at most `max_concurrency` in flight and a per-miner deadline, yielding
+    (key, result) pairs in completion order. A job that fails or misses its deadline yields None.
+    When the overall `deadline` (a time.monotonic() value) passes, no further jobs are started and jobs
+    still running are cut off, their keys are never yielded; jobs that finished before it are still
+    yielded, however late the consumer asks for them.
+
+    Start order rotates between rounds, so the same miners are not always the ones queued behind the
+    concurrency cap.
+    """
+
+    def __init__(self):
+        self._rounds = 0
+
+    def _fair_order(self, keys: List[Hashable], max_concurrency: int) -> List[Hashable]:
+        if not keys:
+            return keys
+        ordered = sorted(keys)
+        offset = (self._rounds * max_concurrency) % len(ordered)
+        self._rounds += 1
+        return ordered[offset:] + ordered[:offset]
+
+    async def run(self,
+                  jobs: Dict[Hashable, Callable[[], Awaitable[Any]]],
+                  max_concurrency: int,
+                  timeout: Optional[float] = None,
+                  deadline: Optional[float] = None) -> AsyncIterator[Tuple[Hashable, Any]]:
+        queue = deque(self._fair_order(list(jobs.keys()), max_concurrency))
+        results: asyncio.Queue = asyncio.Queue()
+
+        def remaining() -> Optional[float]:
+            return None if deadline is None else deadline - time.monotonic()
+
+        async def worker():
+            # workers run on while the consumer is busy, so they check the deadline themselves
+            while queue and (deadline is None or remaining() > 0):
+                key = queue.popleft()
+                job_timeout = timeout
+                if deadline is not None:
+                    job_timeout = remaining() if timeout is None else min(timeout, remaining())
+                try:
+                    result = await asyncio.wait_for(jobs[key](), timeout=job_timeout)
+                except asyncio.TimeoutError:
+                    if deadline is not None and remaining() <= 0:
+                        return
+                    logger.warning(f"Miner job exceeded its deadline", key=key, timeout=timeout)
+                    result = None
+                except Exception as e:
+                    logger.error(f"Miner job failed", key=key, error=e)
+                    result = None
+                if deadline is not None and remaining() <= 0:
+                    return
+                results.put_nowait((key, result))
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(max(1, max_concurrency), len(queue)))]
+        try:
+            for _ in range(len(jobs)):
+                # results that finished in time are yielded even when a slow consumer lets the deadline pass
+                try:
+                    result = results.get_nowait()
+                except asyncio.QueueEmpty:
+                    try:
+                        result = await asyncio.wait_for(results.get(), timeout=None if deadline is None else max(0.0, remaining()))
+                    except asyncio.TimeoutError:
+                        return
+                yield result
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
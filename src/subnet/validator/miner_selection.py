@@ -0,0 +1,114 @@
+import random
+from abc import ABC, abstractmethod
+from collections import Counter
+from contextlib import contextmanager
+from typing import List, Optional
+
+from .latency import LATENCY_BUCKETS_MS, LATENCY_ENDPOINT_QUERY, LatencyRecorder
+
+SELECTION_POLICY_RANDOM = 'random'
+SELECTION_POLICY_POWER_OF_TWO = 'power_of_two'
+
+# assumed latency of a miner without observations, and the cap for one slower than the last bucket
+UNKNOWN_LATENCY_MS = 1000.0
+MAX_LATENCY_MS = 2.0 * LATENCY_BUCKETS_MS[-1]
+
+
+class MinerSelectionStats:
+    """
+    What selection policies know about miners beyond their discovery row: observed query latency and
+    the number of queries currently in flight to each of them.
+    """
+
+    def __init__(self, latency: LatencyRecorder):
+        self.latency = latency
+        self.in_flight: Counter = Counter()
+
+    @contextmanager
+    def track(self, miner_key: str):
+        self.in_flight[miner_key] += 1
+        try:
+            yield
+        finally:
+            self.in_flight[miner_key] -= 1
+            if self.in_flight[miner_key] <= 0:
+                del self.in_flight[miner_key]
+
+    def latency_ms(self, miner_key: str) -> Optional[float]:
+        p50 = self.latency.percentile(miner_key, LATENCY_ENDPOINT_QUERY, 0.5)
+        return None if p50 is None else min(p50, MAX_LATENCY_MS)
+
+
+class MinerSelectionPolicy(ABC):
+    """
+    Chooses which of a network's miners answer a gateway query.
+    """
+
+    @abstractmethod
+    def select(self, miners: List[dict], count: int, stats: MinerSelectionStats) -> List[dict]:
+        """
+        Returns at most `count` distinct miners out of `miners` to send the query to.
+        """
+        pass
+
+
+class RandomSelectionPolicy(MinerSelectionPolicy):
+    """
+    A random `count` of the first `sample_size` miners, in the order get_miners_by_network returns them.
+    """
+
+    def __init__(self, sample_size: int = 16, rng: Optional[random.Random] = None):
+        self.sample_size = sample_size
+        self.rng = rng or random.Random()
+
+    def select(self, miners: List[dict], count: int, stats: MinerSelectionStats) -> List[dict]:
+        if len(miners) <= count:
+            return list(miners)
+        pool = miners[:self.sample_size]
+        return self.rng.sample(pool, min(count, len(pool)))
+
+
+class PowerOfTwoSelectionPolicy(MinerSelectionPolicy):
+    """
+    Power-of-two-choices over all miners of the network: each pick draws two candidates at random and keeps
+    the cheaper one, where cost is the observed median latency scaled by in-flight load and divided by the
+    challenge success ratio. With probability `exploration_rate` a pick is uniform instead, so miners
+    without observations, or ones that recovered, keep getting traffic.
+    """
+
+    def __init__(self, exploration_rate: float = 0.1, rng: Optional[random.Random] = None):
+        self.exploration_rate = exploration_rate
+        self.rng = rng or random.Random()
+
+    @staticmethod
+    def cost(miner: dict, stats: MinerSelectionStats) -> float:
+        latency_ms = stats.latency_ms(miner['miner_key'])
+        if latency_ms is None:
+            latency_ms = UNKNOWN_LATENCY_MS
+        total = miner.get('total_challenges') or 0
+        failed = miner.get('failed_challenges') or 0
+        # smoothed so a miner with few challenges is neither perfect nor hopeless
+        success_ratio = (total - failed + 1) / (total + 2)
+        return latency_ms * (1 + stats.in_flight[miner['miner_key']]) / success_ratio
+
+    def select(self, miners: List[dict], count: int, stats: MinerSelectionStats) -> List[dict]:
+        candidates = list(miners)
+        selected = []
+        while candidates and len(selected) < count:
+            if len(candidates) == 1 or self.rng.random() < self.exploration_rate:
+                choice = self.rng.choice(candidates)
+            else:
+                first, second = self.rng.sample(candidates, 2)
+                choice = first if self.cost(first, stats) <= self.cost(second, stats) else second
+            candidates.remove(choice)
+            selected.append(choice)
+        return selected
+
+
+def get_selection_policy(name: str, exploration_rate: float = 0.1) -> MinerSelectionPolicy:
+    if name == SELECTION_POLICY_RANDOM:
+        return RandomSelectionPolicy()
+    elif name == SELECTION_POLICY_POWER_OF_TWO:
+        return PowerOfTwoSelectionPolicy(exploration_rate)
+    else:
+        raise ValueError(f"Unsupported miner selection policy: {name}")
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import aiohttp
+from communex.errors import NetworkTimeoutError
+from communex.module.client import ModuleClient  # type: ignore
+from communex.types import Ss58Address  # type: ignore
+from loguru import logger
+from substrateinterface import Keypair  # type: ignore
+
+try:
+    # private to communex, these sign and address requests exactly like ModuleClient.call
+    from communex.module._protocol import create_method_endpoint, create_request_data  # type: ignore
+except ImportError:
+    create_method_endpoint = create_request_data = None
+    logger.warning("communex request helpers not found, miner calls fall back to a session per call")
+
+# aiohttp treats a zero timeout as no timeout at all, so a call never gets less than this
+MIN_CALL_TIMEOUT = 0.1
+
+
+class PersistentModuleClient(ModuleClient):
+    """
+    ModuleClient that keeps one keep-alive aiohttp session per miner instead of opening a new one
+    for every call. The request and response handling mirror `ModuleClient.call`.
+    """
+
+    def __init__(self, host: str, port: int, key: Keypair):
+        super().__init__(host, port, key)
+        self.last_used = time.monotonic()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # sessions are bound to the loop that created them, so a client used from another loop gets its own
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            if self._loop is not loop:
+                self._discard_session(self._session, self._loop)
+            self._session = aiohttp.ClientSession()
+            self._loop = loop
+        return self._session
+
+    @staticmethod
+    def _discard_session(session: Optional[aiohttp.ClientSession], loop: Optional[asyncio.AbstractEventLoop]):
+        # a session can only be closed on its own loop: right away while it runs, otherwise when it runs next
+        if session is None or session.closed or loop is None or loop.is_closed():
+            return
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        else:
+            loop.call_soon_threadsafe(lambda: loop.create_task(session.close()))
+
+    async def call(self, fn: str, target_key: Ss58Address, params: Any = {}, timeout: int = 16,
+                   loads: Callable[[str], Any] = json.loads) -> Any:
+        self.last_used = time.monotonic()
+        if create_request_data is None:
+            return await super().call(fn, target_key, params, timeout)
+        serialized_data, headers = create_request_data(self.key, target_key, params)
+
+        try:
+            async with self._get_session().post(
+                create_method_endpoint(self.host, self.port, fn),
+                json=json.loads(serialized_data),
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            ) as response:
+                if response.status != 200:
+                    response_j = await response.json()
+                    raise Exception(f"Unexpected status code: {response.status}, response: {response_j}")
+                if response.content_type != "application/json":
+                    raise Exception(f"Unknown content type: {response.content_type}")
+                return await asyncio.wait_for(response.json(loads=loads), timeout=timeout)
+        except asyncio.exceptions.TimeoutError as e:
+            raise NetworkTimeoutError(
+                f"The call took longer than the timeout of {timeout} second(s)"
+            ).with_traceback(e.__traceback__)
+
+    async def close(self):
+        session, self._session = self._session, None
+        if session is not None and not session.closed and self._loop is asyncio.get_running_loop():
+            await session.close()
+        else:
+            self._discard_session(session, self._loop)
+
+
+class ModuleClientCache:
+    """
+    Miner clients keyed by (ip, port), shared by the validation loop and the gateway query path.
+    Clients idle for longer than `idle_timeout` seconds are closed, as is a miner's previous client
+    once the metagraph reports a new address for its key and no other key still uses it.
+    """
+
+    def __init__(self, key: Keypair, idle_timeout: int = 300):
+        self.key = key
+        self.idle_timeout = idle_timeout
+        self._clients: Dict[Tuple[str, int], PersistentModuleClient] = {}
+        self._addresses: Dict[str, Tuple[str, int]] = {}
+        self._last_eviction = time.monotonic()
+
+    async def get(self, ip: str, port: int, miner_key: Optional[str] = None) -> PersistentModuleClient:
+        address = (ip, int(port))
+        if miner_key is not None:
+            previous = self._addresses.get(miner_key)
+            self._addresses[miner_key] = address
+            # several keys can share an address, so their client is left to idle eviction
+            if previous is not None and previous != address and previous not in self._addresses.values():
+                logger.debug(f"Miner address changed, dropping its client", miner_key=miner_key, previous=previous, address=address)
+                await self._close(previous)
+
+        await self.evict_idle()
+
+        client = self._clients.get(address)
+        if client is None:
+            client = PersistentModuleClient(address[0], address[1], self.key)
+            self._clients[address] = client
+        return client
+
+    async def evict_idle(self):
+        now = time.monotonic()
+        if now - self._last_eviction < min(self.idle_timeout, 60):
+            return
+        self._last_eviction = now
+
+        idle = [address for address, client in self._clients.items() if now - client.last_used >= self.idle_timeout]
+        for address in idle:
+            await self._close(address)
+        if idle:
+            logger.debug(f"Evicted idle miner clients", evicted=len(idle), remaining=len(self._clients))
+
+    async def close(self):
+        for address in list(self._clients.keys()):
+            await self._close(address)
+
+    async def _close(self, address: Tuple[str, int]):
+        client = self._clients.pop(address, None)
+        if client is not None:
+            await client.close()
+
+    def __len__(self):
+        return len(self._clients)
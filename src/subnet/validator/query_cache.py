@@ -0,0 +1,146 @@
+import json
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from loguru import logger
+
+from src.subnet.validator.chain_tip import ChainTipCache
+from src.subnet.validator.encryption import generate_hash
+from src.subnet.validator.validator import Validator
+
+# carries the cache status from the query API to format_response, which turns it into headers
+CACHE_METADATA_KEY = '_cache'
+CACHE_HIT = 'HIT'
+CACHE_MISS = 'MISS'
+
+# identify one request rather than the result, so they are not cached and every hit gets its own
+PER_REQUEST_KEYS = ('request_id', 'timestamp')
+
+
+def cache_headers(data: dict) -> Dict[str, str]:
+    metadata = data.pop(CACHE_METADATA_KEY, None)
+    if metadata is None:
+        return {}
+    max_age = metadata['max_age']
+    return {
+        'X-Cache': metadata['status'],
+        'Cache-Control': f'public, max-age={max_age}' if max_age > 0 else 'no-store',
+    }
+
+
+def _serialize(obj: Any) -> str:
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class QueryResultCache:
+    """
+    Two-tier cache of miner query results keyed by network, model kind and the hash of the normalized
+    query. The in-process LRU answers repeated queries of one gateway worker, Redis shares results
+    between workers; Redis errors are logged and the cache carries on with the in-process tier.
+
+    Verified results of queries pinned to finalized blocks are kept for `finalized_ttl` seconds, other
+    non-empty results for `ttl` seconds. A query is pinned by the `block_heights` it covers, which are
+    finalized once all of them are confirmed below the `chain_tip`; callers that know a result is final
+    by other means pass `finalized` instead. Empty results are never cached. Only the result is cached, a hit
+    is answered with a fresh request_id and timestamp.
+    """
+
+    def __init__(self, redis=None, max_entries: int = 1024, ttl: int = 30, finalized_ttl: int = 3600,
+                 chain_tip: Optional[ChainTipCache] = None):
+        self.redis = redis
+        self.chain_tip = chain_tip
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.finalized_ttl = finalized_ttl
+        self._local: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+
+    @staticmethod
+    def cache_key(network: str, model_kind: str, query: str) -> str:
+        query_hash = generate_hash(Validator.format_query_string(query))
+        return f"query_cache:{network}:{model_kind}:{query_hash}"
+
+    def ttl_for(self, data: dict, finalized: bool) -> int:
+        if not data.get('response'):
+            return 0
+        if finalized and data.get('verified'):
+            return self.finalized_ttl
+        return self.ttl
+
+    def _get_local(self, key: str) -> Optional[Tuple[str, float]]:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        remaining = expires_at - time.monotonic()
+        if remaining <= 0:
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return payload, remaining
+
+    def _put_local(self, key: str, payload: str, ttl: float):
+        self._local[key] = (time.monotonic() + ttl, payload)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    async def _get_redis(self, key: str) -> Optional[Tuple[str, float]]:
+        if self.redis is None:
+            return None
+        try:
+            pipeline = self.redis.pipeline()
+            pipeline.get(key)
+            pipeline.ttl(key)
+            payload, remaining = await pipeline.execute()
+        except Exception as e:
+            logger.warning(f"Query cache read from redis failed", error=e)
+            return None
+        if payload is None or remaining <= 0:
+            return None
+        return (payload.decode() if isinstance(payload, bytes) else payload), float(remaining)
+
+    async def _put_redis(self, key: str, payload: str, ttl: int):
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(key, payload, ex=ttl)
+        except Exception as e:
+            logger.warning(f"Query cache write to redis failed", error=e)
+
+    async def get_or_query(self, network: str, model_kind: str, query: str,
+                           fetch: Callable[[], Awaitable[dict]], finalized: bool = False,
+                           block_heights: Optional[Iterable[int]] = None) -> dict:
+        key = self.cache_key(network, model_kind, query)
+
+        cached = self._get_local(key)
+        if cached is None:
+            cached = await self._get_redis(key)
+            if cached is not None:
+                self._put_local(key, *cached)
+
+        if cached is not None:
+            payload, remaining = cached
+            logger.debug(f"Query cache hit", network=network, model_kind=model_kind)
+            # every hit decodes its own copy, routes transform the response in place
+            return {
+                **json.loads(payload),
+                'request_id': str(uuid.uuid4()),
+                'timestamp': datetime.utcnow(),
+                CACHE_METADATA_KEY: {'status': CACHE_HIT, 'max_age': int(remaining)},
+            }
+
+        data = await fetch()
+        if not finalized and block_heights is not None and self.chain_tip is not None and data.get('verified'):
+            finalized = await self.chain_tip.is_final(network, block_heights)
+        ttl = self.ttl_for(data, finalized)
+        if ttl > 0:
+            result = {key: value for key, value in data.items() if key not in PER_REQUEST_KEYS}
+            payload = json.dumps(result, default=_serialize)
+            self._put_local(key, payload, ttl)
+            await self._put_redis(key, payload, ttl)
+        return {**data, CACHE_METADATA_KEY: {'status': CACHE_MISS, 'max_age': ttl}}
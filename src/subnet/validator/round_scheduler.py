@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+from typing import AsyncIterator, Optional, Set, Tuple
+
+from loguru import logger
+
+
+class TerminateEvent(threading.Event):
+    """
+    threading.Event that coroutines can also await without blocking their loop. Threads keep using
+    `wait()`; `set()` additionally wakes every pending `wait_async()` through its loop.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # reentrant: signal handlers call set() on the loop thread, possibly while wait_async() holds the lock
+        self._lock = threading.RLock()
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = set()
+
+    @staticmethod
+    def _wake(future: asyncio.Future):
+        if not future.done():
+            future.set_result(True)
+
+    def set(self):
+        super().set()
+        with self._lock:
+            waiters = list(self._waiters)
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(self._wake, future)
+            except RuntimeError:
+                # the waiting loop is already closed
+                pass
+
+    async def wait_async(self, timeout: Optional[float] = None) -> bool:
+        if self.is_set():
+            return True
+        loop = asyncio.get_running_loop()
+        waiter = (loop, loop.create_future())
+        with self._lock:
+            self._waiters.add(waiter)
+        try:
+            if not self.is_set():
+                await asyncio.wait({waiter[1]}, timeout=timeout)
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+        return self.is_set()
+
+
+class RoundScheduler:
+    """
+    Fixed-rate round ticks: rounds start every `interval` seconds measured from the first one, so
+    time spent in a round does not push the schedule back. A round that overruns its slot is
+    followed immediately by the next, without bursting to catch up on the missed slots.
+    """
+
+    def __init__(self, terminate_event: TerminateEvent, interval: float):
+        self.terminate_event = terminate_event
+        self.interval = interval
+        self._next_start: Optional[float] = None
+
+    def seconds_until_next(self) -> float:
+        """
+        Seconds until the next round is due, zero when it is already late.
+        """
+        if self._next_start is None:
+            return 0.0
+        return max(0.0, self._next_start - time.monotonic())
+
+    async def ticks(self) -> AsyncIterator[int]:
+        next_start = time.monotonic()
+        round_number = 0
+        while not self.terminate_event.is_set():
+            self._next_start = next_start + self.interval
+            yield round_number
+            round_number += 1
+
+            now = time.monotonic()
+            next_start = max(next_start + self.interval, now)
+            sleep_time = next_start - now
+            if sleep_time > 0:
+                logger.info(f"Sleeping for {sleep_time}")
+                if await self.terminate_event.wait_async(sleep_time):
+                    break
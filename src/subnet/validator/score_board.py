@@ -0,0 +1,69 @@
+import os
+import pickle
+import time
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+
+class ScoreBoard:
+    """
+    Persistent per-miner scores for sharded rounds, where each round only challenges a rotating
+    subset of miners. A miner's last score decays with `half_life` until its shard comes around
+    again, and the rotation cursor is stored alongside so a restart resumes where it left off.
+    """
+
+    def __init__(self, score_board_file_name):
+        self.score_board_file_name = score_board_file_name
+        self._scores: Optional[Dict[str, tuple[float, float]]] = None
+        self._cursor = 0
+
+    def _load(self):
+        if self._scores is not None:
+            return
+        if not os.path.exists(self.score_board_file_name):
+            logger.debug(f"File {self.score_board_file_name} does not exist, starting an empty score board")
+            self._scores, self._cursor = {}, 0
+            return
+        with open(self.score_board_file_name, 'rb') as file:
+            data = pickle.load(file)
+        self._scores, self._cursor = data['scores'], data['cursor']
+        logger.debug(f"Read score board from {self.score_board_file_name}", miners=len(self._scores))
+
+    def _store(self):
+        with open(self.score_board_file_name, 'wb') as file:
+            pickle.dump({'scores': self._scores, 'cursor': self._cursor}, file)
+        logger.debug(f"Stored score board to {self.score_board_file_name}")
+
+    def next_shard(self, miner_keys: List[str], shard_size: int) -> List[str]:
+        """
+        The next `shard_size` miners in key order, wrapping around, so every miner is visited once
+        every ceil(len(miner_keys) / shard_size) rounds.
+        """
+        self._load()
+        ordered = sorted(miner_keys)
+        if len(ordered) <= shard_size:
+            return ordered
+        start = self._cursor % len(ordered)
+        shard = (ordered[start:] + ordered[:start])[:shard_size]
+        self._cursor = (start + shard_size) % len(ordered)
+        return shard
+
+    def update(self, scores: Dict[str, float], registered_keys: List[str]):
+        """
+        Records this round's scores and forgets miners that are no longer registered.
+        """
+        self._load()
+        now = time.time()
+        registered = set(registered_keys)
+        self._scores = {key: entry for key, entry in self._scores.items() if key in registered}
+        self._scores.update({key: (score, now) for key, score in scores.items()})
+        self._store()
+
+    def decayed_scores(self, half_life: int) -> Dict[str, float]:
+        self._load()
+        now = time.time()
+        return {
+            key: score * 0.5 ** (max(0.0, now - updated_at) / half_life)
+            for key, (score, updated_at) in self._scores.items()
+        }
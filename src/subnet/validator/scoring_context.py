@@ -0,0 +1,36 @@
+from typing import Callable, Dict, List, Tuple
+
+from loguru import logger
+
+from src.subnet.validator.database.models.miner_receipt import MinerReceiptManager
+
+
+class ScoringContext:
+    """
+    Everything the scoring loop needs from the receipts, read once per round: the adjusted network
+    weights and the receipt multiplier of every (network, miner_key). Miners without receipts score
+    with a multiplier of 1.
+    """
+
+    def __init__(self, network_weights: Dict[str, float], multipliers: Dict[Tuple[str, str], float]):
+        self.network_weights = network_weights
+        self.total_weight = sum(network_weights.values())
+        self.multipliers = multipliers
+
+    @classmethod
+    async def build(cls,
+                    miner_receipt_manager: MinerReceiptManager,
+                    adjust_network_weights: Callable[[Dict[str, int]], Dict[str, float]]) -> 'ScoringContext':
+        organic_usage = await miner_receipt_manager.get_receipts_count_by_networks()
+        network_weights = adjust_network_weights(organic_usage)
+        logger.debug(f"Adjusted weights", adjusted_weights=network_weights)
+
+        rows: List[Dict] = await miner_receipt_manager.get_receipt_miner_multiplier()
+        multipliers = {(row['network'], row['miner_key']): row['multiplier'] for row in rows}
+        return cls(network_weights, multipliers)
+
+    def multiplier(self, network: str, miner_key: str) -> float:
+        return self.multipliers.get((network, miner_key), 1)
+
+    def network_influence(self, network: str) -> float:
+        return self.network_weights[network] / self.total_weight
@@ -1,35 +1,64 @@
 import asyncio
+import functools
 import json
 import random
-import threading
 import time
 import traceback
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
-from random import sample
-from typing import cast, Dict, Optional
+from typing import Any, Callable, Optional
 
 from communex.client import CommuneClient  # type: ignore
 from communex.errors import NetworkTimeoutError
-from communex.misc import get_map_modules
-from communex.module.client import ModuleClient  # type: ignore
 from communex.module.module import Module  # type: ignore
 from communex.types import Ss58Address  # type: ignore
 from loguru import logger
+from pydantic import ValidationError
 from substrateinterface import Keypair  # type: ignore
 from ._config import ValidatorSettings, load_base_weights
 
+from .challenges.assignment_plan import ChallengeAssignment, ChallengeAssignmentPlan
+from .challenges.challenge_pool import ChallengePool
 from .database.models.challenge_balance_tracking import ChallengeBalanceTrackingManager
 from .database.models.challenge_funds_flow import ChallengeFundsFlowManager
-from .encryption import generate_hash
-from .helpers import raise_exception_if_not_registered, get_ip_port, cut_to_max_allowed_weights
+from .circuit_breaker import MinerCircuitBreaker
+from .database.models.miner_latency import MinerLatencyManager
+from .discovery_cache import DiscoveryCache
+from .encryption import canonical_loads, generate_hash, generate_response_hash
+from .helpers import raise_exception_if_not_registered, cut_to_max_allowed_weights
+from .latency import LatencyRecorder, LATENCY_ENDPOINT_DISCOVERY, LATENCY_ENDPOINT_QUERY, challenge_endpoint
+from .metagraph import MetagraphService, MetagraphSnapshot, MinerModuleInfo
+from .miner_scheduler import MinerChallengeScheduler
+from .miner_selection import MinerSelectionPolicy, MinerSelectionStats, RandomSelectionPolicy
+from .module_client_cache import MIN_CALL_TIMEOUT, ModuleClientCache
+from .round_scheduler import RoundScheduler, TerminateEvent
+from .score_board import ScoreBoard
+from .scoring_context import ScoringContext
+from .weight_submitter import WeightSubmitter
 from .weights_storage import WeightsStorage
 from src.subnet.validator.database.models.miner_discovery import MinerDiscoveryManager
 from src.subnet.validator.database.models.miner_receipt import MinerReceiptManager
 from src.subnet.protocol import Challenge, ChallengesResponse, ChallengeMinerResponse, Discovery, NETWORK_BITCOIN, \
-    NETWORK_COMMUNE
+    NETWORK_COMMUNE, MODEL_KIND_FUNDS_FLOW, MODEL_KIND_BALANCE_TRACKING
 from .. import VERSION
 
+# model kind -> (field of the miner's challenge output that is checked, value recorded when the challenge fails)
+CHALLENGE_OUTPUTS = {
+    MODEL_KIND_FUNDS_FLOW: ('tx_id', "0x"),
+    MODEL_KIND_BALANCE_TRACKING: ('balance', 0),
+}
+
+@dataclass
+class PreparedRound:
+    miners_module_info: dict[int, MinerModuleInfo]
+    round_miners: dict[int, MinerModuleInfo]
+    changed_uids: set[int]
+    discoveries: dict[int, Discovery]
+    plan: ChallengeAssignmentPlan
+    scoring_context: ScoringContext
+    discovery_seconds: float = 0.0  # spent out of ROUND_DEADLINE before the first challenge
+
 
 class Validator(Module):
 
@@ -45,6 +74,13 @@ class Validator(Module):
             miner_receipt_manager: MinerReceiptManager,
             query_timeout: int = 60,
             challenge_timeout: int = 60,
+            client_idle_timeout: int = 300,
+            metagraph_refresh_interval: int = 60,
+            score_board: Optional[ScoreBoard] = None,
+            miner_latency_manager: Optional[MinerLatencyManager] = None,
+            latency_rollup_interval: int = 300,
+            query_hedging: bool = False,
+            selection_policy: Optional[MinerSelectionPolicy] = None,
 
     ) -> None:
         super().__init__()
@@ -57,41 +93,63 @@ class Validator(Module):
         self.query_timeout = query_timeout
         self.weights_storage = weights_storage
         self.miner_discovery_manager = miner_discovery_manager
-        self.terminate_event = threading.Event()
+        self.terminate_event = TerminateEvent()
         self.challenge_funds_flow_manager = challenge_funds_flow_manager
         self.challenge_balance_tracking_manager = challenge_balance_tracking_manager
-
-    @staticmethod
-    def get_addresses(client: CommuneClient, netuid: int) -> dict[int, str]:
-        modules_adresses = client.query_map_address(netuid)
-        for id, addr in modules_adresses.items():
-            if addr.startswith('None'):
-                port = addr.split(':')[1]
-                modules_adresses[id] = f'0.0.0.0:{port}'
-        logger.debug(f"Got modules addresses", modules_adresses=modules_adresses)
-        return modules_adresses
-
-    async def _challenge_miner(self, miner_info):
+        self.challenge_pool = ChallengePool(challenge_funds_flow_manager, challenge_balance_tracking_manager)
+        self.miner_scheduler = MinerChallengeScheduler()
+        self.module_clients = ModuleClientCache(key, client_idle_timeout)
+        self.discovery_cache = DiscoveryCache()
+        self.metagraph = MetagraphService(client, netuid, metagraph_refresh_interval, self.terminate_event)
+        self._metagraph_snapshot: Optional[MetagraphSnapshot] = None
+        self._stored_metadata: dict[str, dict] = {}
+        self._preparation_seconds = 0.0
+        self.weight_submitter = WeightSubmitter()
+        self.circuit_breaker = MinerCircuitBreaker()
+        self.latency = LatencyRecorder()
+        self._query_flights: dict[tuple, asyncio.Future] = {}
+        self.query_hedging = query_hedging
+        self.selection_policy = selection_policy or RandomSelectionPolicy()
+        self.selection_stats = MinerSelectionStats(self.latency)
+        self.miner_latency_manager = miner_latency_manager
+        self.latency_rollup_interval = latency_rollup_interval
+        self.score_board = score_board or ScoreBoard('score_board.pkl')
+
+    async def _discover_miner(self, miner_info, ttl: int = 0) -> Optional[Discovery]:
+        connection, miner_metadata = miner_info
+        module_ip, module_port = connection
+        miner_key = miner_metadata['key']
+        address = (module_ip, int(module_port))
+
+        discovery = self.discovery_cache.get(miner_key, address, ttl)
+        if discovery:
+            return discovery
+
+        client = await self.module_clients.get(module_ip, module_port, miner_key)
+        discovery = await self._get_discovery(client, miner_key)
+        if discovery:
+            logger.debug(f"Got discovery for miner", miner_key=miner_key)
+            self.discovery_cache.put(miner_key, address, discovery)
+        return discovery
+
+    async def _challenge_miner(self, miner_info, discovery: Discovery, assignment: ChallengeAssignment) -> tuple[Optional[ChallengeMinerResponse], Optional[bool]]:
+        """
+        Returns the miner's challenge response and whether it was reachable, which drives its circuit breaker.
+        Reachability is None when the miner was never called.
+        """
         start_time = time.time()
+        miner_key = None
         try:
             connection, miner_metadata = miner_info
             module_ip, module_port = connection
             miner_key = miner_metadata['key']
-            client = ModuleClient(module_ip, int(module_port), self.key)
+            client = await self.module_clients.get(module_ip, module_port, miner_key)
 
             logger.info(f"Challenging miner", miner_key=miner_key)
 
-            # Discovery Phase
-            discovery = await self._get_discovery(client, miner_key)
-            if not discovery:
-                return None
-
-            logger.debug(f"Got discovery for miner", miner_key=miner_key)
-
-            # Challenge Phase
-            challenge_response = await self._perform_challenges(client, miner_key, discovery)
+            challenge_response, reachable = await self._perform_challenges(client, miner_key, assignment)
             if not challenge_response:
-                return None
+                return None, reachable
 
             return ChallengeMinerResponse(
                 version=discovery.version,
@@ -101,10 +159,10 @@ class Validator(Module):
                 funds_flow_challenge_expected=challenge_response.funds_flow_challenge_expected,
                 balance_tracking_challenge_actual=challenge_response.balance_tracking_challenge_actual,
                 balance_tracking_challenge_expected=challenge_response.balance_tracking_challenge_expected,
-            )
+            ), reachable
         except Exception as e:
             logger.error(f"Failed to challenge miner", error=e, miner_key=miner_key)
-            return None
+            return None, False
         finally:
             end_time = time.time()
             execution_time = end_time - start_time
@@ -112,91 +170,83 @@ class Validator(Module):
 
     async def _get_discovery(self, client, miner_key) -> Discovery:
         try:
-            discovery = await client.call(
-                "discovery",
-                miner_key,
-                {"validator_version": str(VERSION), "validator_key": self.key.ss58_address},
-                timeout=self.challenge_timeout,
-            )
+            with self.latency.measure(miner_key, LATENCY_ENDPOINT_DISCOVERY):
+                discovery = await client.call(
+                    "discovery",
+                    miner_key,
+                    {"validator_version": str(VERSION), "validator_key": self.key.ss58_address},
+                    timeout=self.challenge_timeout,
+                )
 
             return Discovery(**discovery)
         except Exception as e:
             logger.info(f"Miner failed to get discovery", miner_key=miner_key, error=e)
             return None
 
-    async def _perform_challenges(self, client, miner_key, discovery) -> ChallengesResponse | None:
-
-        async def execute_funds_flow_challenge(funds_flow_challenge):
-            funds_flow_challenge_actual = "0x"
-            try:
-                funds_flow_challenge = Challenge.model_validate_json(funds_flow_challenge)
-                funds_flow_challenge = await client.call(
-                    "challenge",
-                    miner_key,
-                    {"challenge": funds_flow_challenge.model_dump(), "validator_key": self.key.ss58_address},
-                    timeout=self.challenge_timeout,
-                )
-
-                if funds_flow_challenge is not None:
-                    funds_flow_challenge = Challenge(**funds_flow_challenge)
-                    funds_flow_challenge_actual = funds_flow_challenge.output['tx_id']
-                    logger.debug(f"Funds flow challenge result", funds_flow_challenge_output=funds_flow_challenge.output, miner_key=miner_key)
-                return funds_flow_challenge_actual
-
-            except NetworkTimeoutError:
-                logger.error(f"Miner failed to perform challenges - timeout", miner_key=miner_key)
-            except Exception as e:
-                logger.error(f"Miner failed to perform challenges", error=e, miner_key=miner_key, traceback=traceback.format_exc())
-            finally:
-                return funds_flow_challenge_actual
-
-        async def execute_balance_tracking_challenge(balance_tracking_challenge):
-            balance_tracking_challenge_actual = 0
-            try:
-                balance_tracking_challenge = Challenge.model_validate_json(balance_tracking_challenge)
-                balance_tracking_challenge = await client.call(
+    async def _execute_challenge(self, client, miner_key, model_kind: str, challenge: Challenge, deadline: float) -> tuple[Any, bool]:
+        """
+        Returns the challenge output, or the kind's failed value, and whether the miner was reachable: a call
+        that errors or misses the deadline is a transport failure, a wrong or malformed answer is not.
+        """
+        output_field, failed_value = CHALLENGE_OUTPUTS[model_kind]
+        try:
+            with self.latency.measure(miner_key, challenge_endpoint(model_kind)):
+                result = await client.call(
                     "challenge",
                     miner_key,
-                    {"challenge": balance_tracking_challenge.model_dump(), "validator_key": self.key.ss58_address},
-                    timeout=self.challenge_timeout,
+                    {"challenge": challenge.model_dump(), "validator_key": self.key.ss58_address},
+                    timeout=max(MIN_CALL_TIMEOUT, deadline - time.monotonic()),
                 )
-
-                if balance_tracking_challenge is not None:
-                    balance_tracking_challenge = Challenge(**balance_tracking_challenge)
-                    balance_tracking_challenge_actual = balance_tracking_challenge.output['balance']
-                    logger.debug(f"Balance tracking challenge result", balance_tracking_challenge_output=balance_tracking_challenge.output, miner_key=miner_key)
-            except NetworkTimeoutError:
-                logger.error(f"Miner failed to perform challenges - timeout", miner_key=miner_key)
-            except Exception as e:
-                logger.error(f"Miner failed to perform challenges", error=e, miner_key=miner_key, traceback=traceback.format_exc())
-            finally:
-                return balance_tracking_challenge_actual
+        except NetworkTimeoutError:
+            logger.error(f"Miner failed to perform challenges - timeout", model_kind=model_kind, miner_key=miner_key)
+            return failed_value, False
+        except Exception as e:
+            logger.error(f"Miner failed to perform challenges", model_kind=model_kind, error=e, miner_key=miner_key, traceback=traceback.format_exc())
+            return failed_value, False
 
         try:
-            funds_flow_challenge, tx_id = await self.challenge_funds_flow_manager.get_random_challenge(discovery.network)
-            if funds_flow_challenge is None:
-                logger.warning(f"Failed to get funds flow challenge", miner_key=miner_key)
-                return None
-            funds_flow_challenge_actual = await execute_funds_flow_challenge(funds_flow_challenge)
+            if result is None:
+                return failed_value, True
 
-            balance_tracking_challenge, balance_tracking_expected_response = await self.challenge_balance_tracking_manager.get_random_challenge(discovery.network)
-            if balance_tracking_challenge is None:
-                logger.warning(f"Failed to get balance tracking challenge", miner_key=miner_key)
-                return None
-            balance_tracking_challenge_actual = await execute_balance_tracking_challenge(balance_tracking_challenge)
+            result = Challenge(**result)
+            logger.debug(f"Challenge result", model_kind=model_kind, challenge_output=result.output, miner_key=miner_key)
+            return result.output[output_field], True
+        except Exception as e:
+            logger.error(f"Miner returned an invalid challenge result", model_kind=model_kind, error=e, miner_key=miner_key)
+            return failed_value, True
+
+    async def _perform_challenges(self, client, miner_key, assignment: ChallengeAssignment) -> tuple[ChallengesResponse | None, Optional[bool]]:
+        """
+        Returns the challenges response and whether the miner answered at least one challenge call, or None
+        when the miner was never called because one of its challenges could not be parsed.
+        """
+        # the challenges come from our own pool: one that does not parse is the validator's fault, not the miner's
+        try:
+            challenges = {model_kind: Challenge.model_validate_json(challenge_json) for model_kind, (challenge_json, _) in assignment.items()}
+        except ValidationError as e:
+            logger.error(f"Malformed challenge in the challenge pool, skipping miner", error=e, miner_key=miner_key)
+            return None, None
+
+        # every challenge kind is dispatched at once and shares one CHALLENGE_TIMEOUT deadline
+        deadline = time.monotonic() + self.challenge_timeout
+        model_kinds = list(challenges.keys())
+        try:
+            results = await asyncio.gather(*[
+                self._execute_challenge(client, miner_key, model_kind, challenges[model_kind], deadline)
+                for model_kind in model_kinds
+            ])
+            actual = {model_kind: output for model_kind, (output, _) in zip(model_kinds, results)}
+            reachable = any(answered for _, answered in results)
 
             return ChallengesResponse(
-                funds_flow_challenge_actual=funds_flow_challenge_actual,
-                funds_flow_challenge_expected=tx_id,
-                balance_tracking_challenge_actual=balance_tracking_challenge_actual,
-                balance_tracking_challenge_expected=balance_tracking_expected_response,
-            )
-        except NetworkTimeoutError as e:
-            logger.error(f"Miner failed to perform challenges - timeout", error=e, miner_key=miner_key)
-            return None
+                funds_flow_challenge_actual=actual[MODEL_KIND_FUNDS_FLOW],
+                funds_flow_challenge_expected=assignment[MODEL_KIND_FUNDS_FLOW][1],
+                balance_tracking_challenge_actual=actual[MODEL_KIND_BALANCE_TRACKING],
+                balance_tracking_challenge_expected=assignment[MODEL_KIND_BALANCE_TRACKING][1],
+            ), reachable
         except Exception as e:
             logger.error(f"Miner failed to perform challenges", error=e, miner_key=miner_key, traceback=traceback.format_exc())
-            return None
+            return None, False
 
     @staticmethod
     def _score_miner(response: ChallengeMinerResponse, receipt_miner_multiplier: float) -> float:
@@ -259,80 +309,232 @@ class Validator(Module):
         return adjusted_weights
 
     async def validate_step(self, netuid: int, settings: ValidatorSettings) -> None:
+        prepared = await self.prepare_round(settings)
+        await self.execute_round(prepared, settings)
+
+    async def prepare_round(self, settings: ValidatorSettings) -> PreparedRound:
+        """
+        Everything a round needs before its first challenge is sent: the metagraph snapshot, the miners
+        to visit, their discoveries, the challenge plan and the scoring context.
+        """
+        preparation_started = time.monotonic()
+        snapshot = await self.metagraph.get_snapshot()
+        raise_exception_if_not_registered(self.key, snapshot.modules)
+        miners_module_info = dict(snapshot.miners)
+        changed_uids = snapshot.diff(self._metagraph_snapshot)
+        self._metagraph_snapshot = snapshot
+
+        logger.info(f"Found miners", miners_module_info=miners_module_info.keys(), changed_miners=len(changed_uids))
+
+        shard_size = settings.SHARD_SIZE
+        if shard_size > 0:
+            shard_keys = set(self.score_board.next_shard([metadata['key'] for _, metadata in miners_module_info.values()], shard_size))
+            round_miners = {uid: info for uid, info in miners_module_info.items() if info[1]['key'] in shard_keys}
+            logger.info(f"Challenging miner shard", shard_miners=round_miners.keys(), total_miners=len(miners_module_info))
+        else:
+            round_miners = miners_module_info
 
+        # miners with an open circuit stay in the round, scoring zero, but get no calls
+        circuit_breaking = settings.CIRCUIT_FAILURE_THRESHOLD > 0
+        reachable_miners = {
+            uid: miner_info for uid, miner_info in round_miners.items()
+            if not circuit_breaking or self.circuit_breaker.allow(miner_info[1]['key'], settings.CIRCUIT_OPEN_INTERVAL)
+        }
+        if len(reachable_miners) < len(round_miners):
+            logger.info(f"Skipping miners with open circuits", skipped_miners=len(round_miners) - len(reachable_miners))
+
+        max_concurrency = settings.MAX_CONCURRENT_MINERS
+        self.discovery_cache.start_round(settings.DISCOVERY_FULL_REFRESH_INTERVAL)
+        discovery_jobs = {
+            uid: functools.partial(self._discover_miner, miner_info, settings.DISCOVERY_CACHE_TTL)
+            for uid, miner_info in reachable_miners.items()
+        }
+        discovery_started = time.monotonic()
+        round_deadline = discovery_started + settings.ROUND_DEADLINE if settings.ROUND_DEADLINE else None
+        discoveries: dict[int, Discovery] = {}
+        discovered: set[int] = set()
+        async for uid, discovery in self.miner_scheduler.run(discovery_jobs, max_concurrency, self.challenge_timeout, round_deadline):
+            discovered.add(uid)
+            if discovery:
+                discoveries[uid] = discovery
+            elif circuit_breaking:
+                self.circuit_breaker.record_failure(miners_module_info[uid][1]['key'], settings.CIRCUIT_FAILURE_THRESHOLD)
+        self._report_cut_off("discovery", [miners_module_info[uid][1]['key'] for uid in discovery_jobs.keys() - discovered])
+        discovery_seconds = time.monotonic() - discovery_started
+
+        miner_networks = {uid: discovery.network for uid, discovery in discoveries.items()}
+        await self.challenge_pool.refresh(settings.CHALLENGE_POOL_REFRESH_INTERVAL, set(miner_networks.values()))
+        plan = ChallengeAssignmentPlan.build(self.challenge_pool, miner_networks, settings.CHALLENGE_WITH_REPLACEMENT)
+        logger.info(f"Built challenge assignment plan", discovered_miners=len(discoveries), assigned_miners=len(plan))
+
+        scoring_context = await ScoringContext.build(
+            self.miner_receipt_manager,
+            functools.partial(self.adjust_network_weights_with_min_threshold, min_threshold_ratio=5),
+        )
+        self._preparation_seconds = time.monotonic() - preparation_started
+        return PreparedRound(miners_module_info, round_miners, changed_uids, discoveries, plan, scoring_context, discovery_seconds)
+
+    async def execute_round(self, prepared: PreparedRound, settings: ValidatorSettings,
+                            on_challenges_done: Optional[Callable[[], None]] = None) -> None:
+        """
+        Challenges, scores and votes on a prepared round. `on_challenges_done` is called once the last
+        challenge call has finished, before results are scored and weights submitted.
+        """
         score_dict: dict[int, float] = {}
-        miners_module_info = {}
-
-        modules = cast(dict[str, Dict], get_map_modules(self.client, netuid=netuid, include_balances=False))
-        modules_addresses = self.get_addresses(self.client, netuid)
-        ip_ports = get_ip_port(modules_addresses)
-
-        raise_exception_if_not_registered(self.key, modules)
-
-        for key in modules.keys():
-            module_meta_data = modules[key]
-            uid = module_meta_data['uid']
-            if uid not in ip_ports:
+        miners_module_info = prepared.miners_module_info
+        scoring_context = prepared.scoring_context
+        shard_size = settings.SHARD_SIZE
+        max_concurrency = settings.MAX_CONCURRENT_MINERS
+
+        challenge_jobs = {
+            uid: functools.partial(self._challenge_miner, miners_module_info[uid], prepared.discoveries[uid], assignment)
+            for uid, assignment in prepared.plan.assignments.items()
+        }
+        challenge_deadline = settings.MINER_CHALLENGE_DEADLINE or 1.5 * self.challenge_timeout
+
+        # responses are scored as they complete and persisted in batches, so stragglers do not hold back the rest
+        stored_keys: set[str] = set()
+        miners_metadata: list[dict] = []
+        miners_challenges: list[tuple[str, int, int]] = []
+        # discovery and challenges share one ROUND_DEADLINE budget, wherever the round was prepared
+        round_deadline = None
+        if settings.ROUND_DEADLINE:
+            round_deadline = time.monotonic() + max(0.0, settings.ROUND_DEADLINE - prepared.discovery_seconds)
+
+        challenged: set[int] = set()
+        async for uid, outcome in self.miner_scheduler.run(challenge_jobs, max_concurrency, challenge_deadline, round_deadline):
+            # the scheduler yields None for a miner that failed or missed its deadline
+            response, reachable = outcome or (None, False)
+            challenged.add(uid)
+            if reachable is None:
+                # never called, so there is nothing to hold against the miner
                 continue
-            module_addr = ip_ports[uid]
-            miners_module_info[uid] = (module_addr, modules[key])
-
-        logger.info(f"Found miners", miners_module_info=miners_module_info.keys())
-
-        for _, miner_metadata in miners_module_info.values():
-            await self.miner_discovery_manager.update_miner_rank(miner_metadata['key'], miner_metadata['emission'])
-
-        challenge_tasks = []
-        for uid, miner_info in miners_module_info.items():
-            challenge_tasks.append(self._challenge_miner(miner_info))
-
-        responses: tuple[ChallengeMinerResponse] = await asyncio.gather(*challenge_tasks)
-
-        for uid, miner_info, response in zip(miners_module_info.keys(), miners_module_info.values(), responses):
+            miner_info = miners_module_info[uid]
+            miner_key = miner_info[1]['key']
+            if not response or response.get_failed_challenges() > 0:
+                # a failing miner may have switched network or graph db, so ask again next round
+                self.discovery_cache.invalidate(miner_key)
+            if settings.CIRCUIT_FAILURE_THRESHOLD > 0:
+                if reachable:
+                    self.circuit_breaker.record_success(miner_key)
+                else:
+                    self.circuit_breaker.record_failure(miner_key, settings.CIRCUIT_FAILURE_THRESHOLD)
             if not response:
-                score_dict[uid] = 0
                 continue
 
-            if isinstance(response, ChallengeMinerResponse):
-                network = response.network
-                version = response.version
-                graph_db = response.graph_db
-                connection, miner_metadata = miner_info
-                miner_address, miner_ip_port = connection
-                miner_key = miner_metadata['key']
-
-                organic_usage = await self.miner_receipt_manager.get_receipts_count_by_networks()
-                adjusted_weights = self.adjust_network_weights_with_min_threshold(organic_usage, min_threshold_ratio=5)
-                logger.debug(f"Adjusted weights", adjusted_weights=adjusted_weights, miner_key=miner_key)
-
-                receipt_miner_multiplier_result = await self.miner_receipt_manager.get_receipt_miner_multiplier(network, miner_key)
-                if not receipt_miner_multiplier_result:
-                    receipt_miner_multiplier = 1
-                else:
-                    receipt_miner_multiplier = receipt_miner_multiplier_result[0]['multiplier']
-
-                score = self._score_miner(response, receipt_miner_multiplier)
-
-                weighted_score = 0
-                total_weight = sum(adjusted_weights.values())
-                weight = adjusted_weights[response.network]
-                network_influence = weight / total_weight
-                weighted_score += score * network_influence
-
-                assert weighted_score <= 1
-                score_dict[uid] = weighted_score
-
-                await self.miner_discovery_manager.store_miner_metadata(uid, miner_key, miner_address, miner_ip_port, network, version, graph_db)
-                await self.miner_discovery_manager.update_miner_challenges(miner_key, response.get_failed_challenges(), 2)
+            score = self._score_miner(response, scoring_context.multiplier(response.network, miner_key))
+            weighted_score = score * scoring_context.network_influence(response.network)
+            assert weighted_score <= 1
+            score_dict[uid] = weighted_score
+            logger.debug(f"Scored miner", miner_key=miner_key, score=score, weighted_score=weighted_score)
+
+            (miner_address, miner_ip_port), _ = miner_info
+            miners_metadata.append({
+                'uid': uid,
+                'miner_key': miner_key,
+                'miner_address': miner_address,
+                'miner_ip_port': miner_ip_port,
+                'network': response.network,
+                'version': response.version,
+                'graph_db': response.graph_db
+            })
+            miners_challenges.append((miner_key, response.get_failed_challenges(), 2))
+
+            if len(miners_challenges) >= settings.MINER_RESULTS_BATCH_SIZE:
+                stored_keys |= await self._persist_miner_results(miners_metadata, miners_challenges)
+                miners_metadata, miners_challenges = [], []
+
+        if on_challenges_done is not None:
+            on_challenges_done()
+
+        stored_keys |= await self._persist_miner_results(miners_metadata, miners_challenges)
+
+        cut_off_keys = [miners_module_info[uid][1]['key'] for uid in challenge_jobs.keys() - challenged]
+        self._report_cut_off("challenge", cut_off_keys)
+        if settings.CIRCUIT_FAILURE_THRESHOLD > 0:
+            for miner_key in cut_off_keys:
+                self.circuit_breaker.record_failure(miner_key, settings.CIRCUIT_FAILURE_THRESHOLD)
+
+        for uid in prepared.round_miners.keys():
+            score_dict.setdefault(uid, 0)
+
+        if shard_size > 0:
+            # weights still cover every miner: the shard's fresh scores plus everyone else's decayed ones
+            uids_by_key = {metadata['key']: uid for uid, (_, metadata) in miners_module_info.items()}
+            self.score_board.update({miners_module_info[uid][1]['key']: score for uid, score in score_dict.items()}, list(uids_by_key.keys()))
+            board_scores = self.score_board.decayed_scores(settings.SHARD_SCORE_HALF_LIFE)
+            score_dict = {uid: board_scores.get(key, 0) for key, uid in uids_by_key.items()}
+
+        changed_keys = {miners_module_info[uid][1]['key'] for uid in prepared.changed_uids} | stored_keys
+        await self.miner_discovery_manager.update_miners_ranks({
+            miner_metadata['key']: miner_metadata['emission']
+            for _, miner_metadata in miners_module_info.values()
+            if miner_metadata['key'] in changed_keys
+        })
+        await self.rollup_latencies()
 
         if not score_dict:
             logger.info("No miner managed to give a valid answer")
             return None
 
+        submission = self.weight_submitter.submit(
+            self.set_weights, settings, score_dict, self.netuid, self.client, self.key,
+            retries=settings.WEIGHT_SUBMISSION_RETRIES,
+            retry_delay=settings.WEIGHT_SUBMISSION_RETRY_DELAY,
+        )
+        submission.add_done_callback(self._on_weights_submitted)
+
+    @staticmethod
+    def _on_weights_submitted(submission: asyncio.Future) -> None:
+        if submission.cancelled():
+            return
+        if submission.exception():
+            logger.error(f"Failed to set weights", error=submission.exception())
+
+    async def rollup_latencies(self) -> None:
+        if self.miner_latency_manager is None or not self.latency.due(self.latency_rollup_interval):
+            return
+        window_start, window_end, histograms = self.latency.drain()
         try:
-            self.set_weights(settings, score_dict, self.netuid, self.client, self.key)
+            await self.miner_latency_manager.store_latency_rollup(
+                window_start, window_end, {key: histogram.to_dict() for key, histogram in histograms.items()}
+            )
         except Exception as e:
-            logger.error(f"Failed to set weights", error=e)
+            logger.error(f"Failed to store latency rollup", error=e, histograms=len(histograms))
+
+    async def latency_rollup_loop(self) -> None:
+        """
+        Rolls latencies up on their own schedule where no validation loop does it after each round,
+        as in the gateway, so request handlers never wait on the write.
+        """
+        while not await self.terminate_event.wait_async(self.latency_rollup_interval):
+            await self.rollup_latencies()
+
+    @staticmethod
+    def _report_cut_off(stage: str, miner_keys: list[str]) -> None:
+        # miners still outstanding when ROUND_DEADLINE passed, scored zero for this round
+        if miner_keys:
+            logger.warning(f"Round deadline cut off miners", stage=stage, cut_off_count=len(miner_keys), cut_off_miners=sorted(miner_keys))
+
+    async def _persist_miner_results(self, miners_metadata: list[dict], miners_challenges: list[tuple[str, int, int]]) -> set[str]:
+        # only miners whose metagraph entry or discovery answer changed are written back,
+        # the challenge update refreshes every answering miner's timestamp
+        changed_metadata = [row for row in miners_metadata if self._stored_metadata.get(row['miner_key']) != row]
+        await self.miner_discovery_manager.store_miners_metadata(changed_metadata)
+        self._stored_metadata.update({row['miner_key']: row for row in changed_metadata})
+        found_keys = await self.miner_discovery_manager.update_miners_challenges(miners_challenges)
+
+        # rows deleted since they were cached are not found, so store them again with this round's challenges
+        missing_metadata = [row for row in miners_metadata if row['miner_key'] not in found_keys]
+        if missing_metadata:
+            missing_keys = {row['miner_key'] for row in missing_metadata}
+            logger.info(f"Restoring deleted miner metadata", miner_keys=sorted(missing_keys))
+            await self.miner_discovery_manager.store_miners_metadata(missing_metadata)
+            await self.miner_discovery_manager.update_miners_challenges(
+                [challenge for challenge in miners_challenges if challenge[0] in missing_keys]
+            )
+            changed_metadata += [row for row in missing_metadata if row not in changed_metadata]
+        return {row['miner_key'] for row in changed_metadata}
 
     def set_weights(self,
                     settings: ValidatorSettings,
@@ -372,21 +574,34 @@ class Validator(Module):
         logger.info("Set weights", action="set_weight", timestamp=datetime.utcnow().isoformat(), weighted_scores=weighted_scores)
 
     async def validation_loop(self, settings: ValidatorSettings) -> None:
-        while not self.terminate_event.is_set():
-            start_time = time.time()
-            await self.validate_step(self.netuid, settings)
-            if self.terminate_event.is_set():
-                logger.info("Terminating validation loop")
-                break
-
-            elapsed = time.time() - start_time
-            if elapsed < settings.ITERATION_INTERVAL:
-                sleep_time = settings.ITERATION_INTERVAL - elapsed
-                logger.info(f"Sleeping for {sleep_time}")
-                self.terminate_event.wait(sleep_time)
-                if self.terminate_event.is_set():
-                    logger.info("Terminating validation loop")
-                    break
+        next_round: Optional[asyncio.Task] = None
+        scheduler = RoundScheduler(self.terminate_event, settings.ITERATION_INTERVAL)
+        try:
+            async for _ in scheduler.ticks():
+                if settings.PIPELINED_ROUNDS:
+                    prepared = await (next_round or self.prepare_round(settings))
+                    next_round = None
+
+                    def prepare_next_round():
+                        # overlaps only what follows the challenges (the last results write, the rank update and the
+                        # rollup, the vote already runs off the loop), so discovery and challenge calls never exceed
+                        # the MAX_CONCURRENT_MINERS cap together; and only when the next round is due before a
+                        # preparation would finish, so a prepared round does not sit out the interval going stale.
+                        # The cadence therefore stays close to preparation plus execution.
+                        nonlocal next_round
+                        if scheduler.seconds_until_next() <= self._preparation_seconds:
+                            next_round = asyncio.create_task(self.prepare_round(settings))
+
+                    await self.execute_round(prepared, settings, on_challenges_done=prepare_next_round)
+                else:
+                    await self.validate_step(self.netuid, settings)
+            logger.info("Terminating validation loop")
+        finally:
+            if next_round is not None and not next_round.done():
+                next_round.cancel()
+                await asyncio.gather(next_round, return_exceptions=True)
+            await asyncio.to_thread(self.weight_submitter.shutdown)
+            await self.module_clients.close()
 
     @staticmethod
     def format_query_string(query_string: str):
@@ -402,6 +617,28 @@ class Validator(Module):
         query = self.format_query_string(query)
         query_hash = generate_hash(query)
 
+        # concurrent identical queries share one miner fan-out and its receipts, each caller keeps its own request_id
+        flight_key = (network, model_kind, query_hash, miner_key)
+        flight = self._query_flights.get(flight_key)
+        if flight is None:
+            flight = asyncio.ensure_future(
+                self._fan_out_query(network, model_kind, query, query_hash, miner_key, request_id, timestamp)
+            )
+            self._query_flights[flight_key] = flight
+            flight.add_done_callback(lambda done: self._end_query_flight(flight_key, done))
+        else:
+            logger.debug(f"Joined in-flight query", network=network, model_kind=model_kind, query_hash=query_hash)
+
+        # shielded, a caller that goes away must not cancel the fan-out other callers are waiting on
+        result = await asyncio.shield(flight)
+        return {**result, "request_id": request_id, "timestamp": timestamp}
+
+    def _end_query_flight(self, flight_key: tuple, flight: asyncio.Future):
+        if self._query_flights.get(flight_key) is flight:
+            del self._query_flights[flight_key]
+
+    async def _fan_out_query(self, network: str, model_kind: str, query: str, query_hash: str,
+                             miner_key: Optional[str], request_id: str, timestamp: datetime) -> dict:
         # Single miner case
         if miner_key:
             miner = await self.miner_discovery_manager.get_miner_by_key(miner_key, network)
@@ -421,7 +658,7 @@ class Validator(Module):
 
             response = await self._query_miner(miner, model_kind, query)
             if response:  # Simplified validation as per your version
-                response_hash = generate_hash(str(response))
+                response_hash = generate_response_hash(response)
                 await self.miner_receipt_manager.store_miner_receipt(
                     request_id,
                     miner_key,
@@ -459,52 +696,64 @@ class Validator(Module):
 
         # Multiple miners case
         select_count = 3
-        sample_size = 16
 
         miners = await self.miner_discovery_manager.get_miners_by_network(network)
-        if len(miners) < 3:
-            top_miners = miners
-        else:
-            top_miners = sample(miners[:sample_size], select_count)
+        top_miners = self.selection_policy.select(miners, select_count, self.selection_stats)
 
-        query_tasks = {
-            asyncio.create_task(self._query_miner(miner, model_kind, query)): miner
-            for miner in top_miners
-        }
+        # Hedged: query two miners and hold the third back until no matching pair arrived within the p90
+        hedge_delay = self._hedge_delay(network, model_kind) if self.query_hedging and len(top_miners) > 2 else None
+        reserve = top_miners[2:] if hedge_delay is not None else []
+
+        query_tasks = {}  # {task: miner}
+
+        def dispatch(miner):
+            task = asyncio.create_task(self._query_miner_hashed(miner, model_kind, query))
+            query_tasks[task] = miner
+            return task
 
         # Track responses by their hash
         responses = {}  # {response_hash: (response, [miners])}
 
         try:
-            pending = set(query_tasks.keys())
+            pending = {dispatch(miner) for miner in top_miners[:len(top_miners) - len(reserve)]}
             start_time = time.time()
 
-            while pending:
-                if time.time() - start_time > self.query_timeout:
+            while pending or reserve:
+                elapsed = time.time() - start_time
+                if elapsed > self.query_timeout:
                     break
 
+                # Hedge when the delay passed, or right away when every queried miner answered without a match
+                if reserve and (not pending or elapsed >= hedge_delay):
+                    miner = reserve.pop(0)
+                    logger.debug(f"Hedging query with another miner", miner_key=miner['miner_key'], query_hash=query_hash)
+                    pending.add(dispatch(miner))
+
+                timeout = self.query_timeout - elapsed
+                if reserve:
+                    timeout = min(timeout, hedge_delay - elapsed)
+
                 # Wait for the next task to complete with timeout
                 done, pending = await asyncio.wait(
                     pending,
-                    timeout=max(0.0, self.query_timeout - (time.time() - start_time)),
+                    timeout=max(0.0, timeout),
                     return_when=asyncio.FIRST_COMPLETED
                 )
 
                 if not done:  # Timeout reached
+                    if reserve:
+                        continue
                     break
 
                 # Process completed tasks
                 for completed_task in done:
                     try:
-                        response = await completed_task
+                        response, response_hash = await completed_task
                         current_miner = query_tasks[completed_task]
 
                         if not response:
                             continue
 
-                        # Hash the response for comparison
-                        response_hash = generate_hash(str(response))
-
                         # Add to or update our response tracking
                         if response_hash in responses:
                             # We found a match!
@@ -537,7 +786,7 @@ class Validator(Module):
                             return {
                                 "request_id": request_id,
                                 "timestamp": timestamp,
-                                "miner_keys": [miner['miner_key'] for miner in top_miners],
+                                "miner_keys": [miner['miner_key'] for miner in query_tasks.values()],
                                 "query_hash": query_hash,
                                 "response_hash": response_hash,
                                 "verified": True,
@@ -575,7 +824,7 @@ class Validator(Module):
                 return {
                     "request_id": request_id,
                     "timestamp": timestamp,
-                    "miner_keys": [miner['miner_key'] for miner in top_miners],
+                    "miner_keys": [miner['miner_key'] for miner in query_tasks.values()],
                     "query_hash": query_hash,
                     "response_hash": first_response_hash,
                     "verified": False,
@@ -589,7 +838,7 @@ class Validator(Module):
             return {
                 "request_id": request_id,
                 "timestamp": timestamp,
-                "miner_keys": [miner['miner_key'] for miner in top_miners],
+                "miner_keys": [miner['miner_key'] for miner in query_tasks.values()],
                 "query_hash": query_hash,
                 "response_hash": None,
                 "verified": False,
@@ -604,19 +853,42 @@ class Validator(Module):
                 if not task.done():
                     task.cancel()
 
+    def _hedge_delay(self, network: str, model_kind: str) -> Optional[float]:
+        # p90 over every miner of the network, so miners without history of their own are hedged too
+        p90_ms = self.latency.group_percentile((network, model_kind), 0.9)
+        if p90_ms is None:
+            # nothing observed yet, query every miner up front
+            return None
+        return min(p90_ms / 1000, self.query_timeout)
+
     async def _query_miner(self, miner, model_kind, query):
         miner_key = miner['miner_key']
         miner_network = miner['network']
         module_ip = miner['miner_address']
         module_port = int(miner['miner_ip_port'])
-        module_client = ModuleClient(module_ip, module_port, self.key)
         try:
-            query_result = await module_client.call(
-                "query",
-                miner_key,
-                {"model_kind": model_kind, "query": query, "validator_key": self.key.ss58_address},
-                timeout=self.query_timeout,
-            )
+            module_client = await self.module_clients.get(module_ip, module_port, miner_key)
+            started = time.perf_counter()
+            try:
+                with self.selection_stats.track(miner_key):
+                    query_result = await module_client.call(
+                        "query",
+                        miner_key,
+                        {"model_kind": model_kind, "query": query, "validator_key": self.key.ss58_address},
+                        timeout=self.query_timeout,
+                        loads=canonical_loads,
+                    )
+            except asyncio.CancelledError:
+                # cut off by a hedge or a match elsewhere: counted as censored, its elapsed time is only a lower bound
+                self.latency.observe_censored(miner_key, LATENCY_ENDPOINT_QUERY, (miner_network, model_kind))
+                raise
+            except Exception:
+                # failed calls only count as errors, their elapsed time says nothing about how fast the miner answers
+                self.latency.observe(miner_key, LATENCY_ENDPOINT_QUERY, time.perf_counter() - started, failed=True,
+                                     group=(miner_network, model_kind))
+                raise
+            self.latency.observe(miner_key, LATENCY_ENDPOINT_QUERY, time.perf_counter() - started,
+                                 group=(miner_network, model_kind))
             if not query_result:
                 return None
 
@@ -625,6 +897,13 @@ class Validator(Module):
             logger.warning(f"Failed to query miner", error=e, miner_key=miner_key)
             return None
 
+    async def _query_miner_hashed(self, miner, model_kind, query) -> tuple[Optional[dict], Optional[str]]:
+        # hashed in the miner's own task as soon as its response is decoded, not when responses are compared
+        response = await self._query_miner(miner, model_kind, query)
+        if not response:
+            return response, None
+        return response, generate_response_hash(response)
+
     @staticmethod
     def unpack_response(response):
         if isinstance(response, list):
@@ -0,0 +1,48 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque
+
+from loguru import logger
+
+
+class WeightSubmitter:
+    """
+    Runs weight submissions one at a time on a dedicated thread so chain latency never blocks the
+    event loop. At most `max_pending` submissions wait behind the one in flight; when the queue is
+    full the oldest waiting one is dropped, as a newer round's weights supersede it.
+    """
+
+    def __init__(self, max_pending: int = 1):
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="weight-submitter")
+        self._pending: Deque[Future] = deque()
+
+    @staticmethod
+    def _with_retries(fn: Callable[..., Any], args: tuple, retries: int, retry_delay: float) -> Any:
+        for attempt in range(retries + 1):
+            try:
+                return fn(*args)
+            except Exception as e:
+                if attempt == retries:
+                    raise
+                logger.warning(f"Weight submission failed, retrying", attempt=attempt + 1, retries=retries, error=e)
+                time.sleep(retry_delay)
+
+    def submit(self, fn: Callable[..., Any], *args, retries: int = 0, retry_delay: float = 0) -> asyncio.Future:
+        while self._pending and self._pending[0].done():
+            self._pending.popleft()
+        waiting = [future for future in self._pending if not future.running()]
+        while len(waiting) >= self.max_pending:
+            dropped = waiting.pop(0)
+            if dropped.cancel():
+                self._pending.remove(dropped)
+                logger.warning(f"Dropped queued weight submission superseded by a newer one")
+
+        future = self._executor.submit(self._with_retries, fn, args, retries, retry_delay)
+        self._pending.append(future)
+        return asyncio.wrap_future(future)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)